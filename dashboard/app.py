@@ -3,40 +3,153 @@
 from __future__ import annotations
 
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import ijson
+import orjson
+import pandas as pd
 import streamlit as st
 
 st.set_page_config(page_title="Koda — Trace Dashboard", page_icon="K", layout="wide")
 
 
-def load_traces(trace_dir: str) -> list[dict]:
-    """Load all trace files from the trace directory."""
-    trace_path = Path(trace_dir)
-    if not trace_path.exists():
+def _list_trace_files(trace_dir: str) -> list[tuple[str, int]]:
+    """List trace files as (path, mtime_ns) pairs, newest first.
+
+    Uses os.scandir so dirent stats come back from the directory read
+    itself, and sorts by name since trace_* filenames sort chronologically.
+    """
+    try:
+        with os.scandir(trace_dir) as it:
+            entries = [
+                e for e in it
+                if e.name.startswith("trace_") and e.name.endswith(".json")
+            ]
+    except OSError:
         return []
 
-    traces = []
-    for f in sorted(trace_path.glob("trace_*.json"), reverse=True):
-        try:
-            with open(f) as fh:
-                traces.append(json.load(fh))
-        except json.JSONDecodeError:
+    entries.sort(key=lambda e: e.name, reverse=True)
+
+    files = []
+    for entry in entries:
+        stat = entry.stat()
+        if stat.st_size == 0:
             continue
-    return traces
+        files.append((entry.path, stat.st_mtime_ns))
+    return files
 
 
-def render_sidebar(traces: list[dict]) -> dict | None:
-    """Render trace selector sidebar."""
+def _summarize(trace: dict) -> dict:
+    """Aggregate overview, cost, and tool stats in one pass over the spans."""
+    durations_total = 0.0
+    api_calls = 0
+    total_input = 0
+    total_output = 0
+    tool_counts: dict[str, int] = {}
+    tool_success: dict[str, int] = {}
+
+    for span in trace.get("spans", []):
+        duration = span.get("duration_ms")
+        if duration:
+            durations_total += duration
+        for event in span.get("events", []):
+            event_type = event.get("event_type")
+            data = event.get("data", {})
+            get = data.get
+            if event_type == "llm_response":
+                total_input += get("input_tokens", 0)
+                total_output += get("output_tokens", 0)
+                api_calls += 1
+            elif event_type == "tool_call":
+                name = get("tool", "unknown")
+                tool_counts[name] = tool_counts.get(name, 0) + 1
+            elif event_type == "tool_result":
+                if get("success"):
+                    name = get("tool", "unknown")
+                    tool_success[name] = tool_success.get(name, 0) + 1
+
+    return {
+        "durations_total": durations_total,
+        "api_calls": api_calls,
+        "total_input": total_input,
+        "total_output": total_output,
+        "tool_counts": tool_counts,
+        "tool_success": tool_success,
+    }
+
+
+@st.cache_data(show_spinner=False)
+def _load_one(path: str, mtime_ns: int) -> dict | None:
+    """Parse a single trace file, cached until the file's mtime changes."""
+    try:
+        trace = orjson.loads(Path(path).read_bytes())
+    except (orjson.JSONDecodeError, OSError):
+        return None
+    # Summarize once at load time so renderers share a single span walk.
+    trace["_summary"] = _summarize(trace)
+    # Pre-serialize tool inputs so the timeline doesn't re-dump identical
+    # dicts on every rerun; this is cached together with the parse.
+    for span in trace.get("spans", []):
+        for event in span.get("events", []):
+            if event.get("event_type") == "tool_call":
+                data = event.get("data", {})
+                data["_rendered_input"] = orjson.dumps(
+                    data.get("input", {}), option=orjson.OPT_INDENT_2
+                ).decode()
+    return trace
+
+
+@st.cache_data(show_spinner=False)
+def _peek_task_id(path: str, mtime_ns: int) -> str | None:
+    """Stream-parse just the task_id from a trace file without loading it all."""
+    try:
+        with open(path, "rb") as fh:
+            for prefix, _event, value in ijson.parse(fh):
+                if prefix == "task_id":
+                    return value
+    except (ijson.JSONError, OSError):
+        pass
+    return None
+
+
+def load_trace_index(trace_dir: str) -> list[tuple[str, str, int]]:
+    """Build a lightweight (task_id, path, mtime_ns) index of the trace directory.
+
+    Only the selected trace is ever fully parsed; the sidebar needs just
+    the task_ids, which are streamed out of each file's first few bytes.
+    """
+    files = _list_trace_files(trace_dir)
+    if not files:
+        return []
+
+    # Peek in parallel: the file reads release the GIL, so cold scans of
+    # large trace directories scale with disk concurrency.
+    with ThreadPoolExecutor(max_workers=min(32, len(files))) as executor:
+        task_ids = executor.map(lambda pm: _peek_task_id(*pm), files)
+
+    return [
+        (task_id, path, mtime_ns)
+        for task_id, (path, mtime_ns) in zip(task_ids, files)
+        if task_id is not None
+    ]
+
+
+def render_sidebar(index: list[tuple[str, str, int]]) -> dict | None:
+    """Render trace selector sidebar and load the selected trace."""
     st.sidebar.title("Koda Traces")
 
-    if not traces:
+    if not index:
         st.sidebar.warning("No traces found. Run the agent to generate traces.")
         return None
 
-    task_ids = [t["task_id"] for t in traces]
+    task_ids = [task_id for task_id, _path, _mtime in index]
     selected = st.sidebar.selectbox("Select trace", task_ids)
-    return next((t for t in traces if t["task_id"] == selected), None)
+    for task_id, path, mtime_ns in index:
+        if task_id == selected:
+            return _load_one(path, mtime_ns)
+    return None
 
 
 def render_overview(trace: dict) -> None:
@@ -45,115 +158,147 @@ def render_overview(trace: dict) -> None:
 
     spans = trace.get("spans", [])
     total_events = trace.get("total_events", 0)
+    summary = trace.get("_summary") or _summarize(trace)
 
     col1, col2, col3 = st.columns(3)
     col1.metric("Spans", len(spans))
     col2.metric("Events", total_events)
+    col3.metric("Duration", f"{summary['durations_total']:.0f}ms")
+
+
+def _render_thought(data: dict) -> None:
+    st.markdown(f"**Thought:** {data.get('text', '')}")
+
+
+def _render_tool_call(data: dict) -> None:
+    rendered = data.get("_rendered_input")
+    if rendered is None:
+        rendered = json.dumps(data.get("input", {}), indent=2)
+    st.code(f"Tool: {data.get('tool', '')} | Input: {rendered}")
+
+
+def _render_tool_result(data: dict) -> None:
+    status = "OK" if data.get("success") else "FAIL"
+    st.markdown(f"**Result [{status}]:** {data.get('output_length', 0)} chars")
+    if data.get("error"):
+        st.error(data["error"])
+
+
+def _render_llm_request(data: dict) -> None:
+    st.markdown(f"**LLM Request:** {data.get('model', '')} ({data.get('message_count', 0)} messages)")
+
+
+def _render_llm_response(data: dict) -> None:
+    tokens = f"{data.get('input_tokens', 0)}/{data.get('output_tokens', 0)}"
+    st.markdown(f"**LLM Response:** {tokens} tokens, stop={data.get('stop_reason', '')}")
+
+
+def _render_cache_hit(data: dict) -> None:
+    st.success(f"Cache hit! Similarity: {data.get('similarity', 0):.2f}, Saved: ${data.get('saved_cost', 0):.4f}")
 
-    # Calculate total duration
-    durations = [s.get("duration_ms", 0) for s in spans if s.get("duration_ms")]
-    total_ms = sum(durations) if durations else 0
-    col3.metric("Duration", f"{total_ms:.0f}ms")
 
+def _render_cache_miss(data: dict) -> None:
+    st.info(f"Cache miss (best score: {data.get('best_score', 0):.2f})")
 
+
+def _render_critic_check(data: dict) -> None:
+    if data.get("passed"):
+        st.success(f"Verification passed ({data.get('total_checks', 0)} checks)")
+    else:
+        st.error(f"Verification failed: {data.get('summary', '')}")
+
+
+def _render_budget_warning(data: dict) -> None:
+    st.warning(f"Budget warning: {data.get('error', '')}")
+
+
+def _render_error(data: dict) -> None:
+    st.error(f"Error: {data.get('error', '')}")
+
+
+def _render_default(data: dict) -> None:
+    st.json(data)
+
+
+# O(1) dispatch on event_type instead of an if/elif ladder per event.
+_RENDERERS = {
+    "thought": _render_thought,
+    "tool_call": _render_tool_call,
+    "tool_result": _render_tool_result,
+    "llm_request": _render_llm_request,
+    "llm_response": _render_llm_response,
+    "cache_hit": _render_cache_hit,
+    "cache_miss": _render_cache_miss,
+    "critic_check": _render_critic_check,
+    "budget_warning": _render_budget_warning,
+    "error": _render_error,
+}
+
+
+@st.fragment
 def render_timeline(trace: dict) -> None:
     """Render a timeline of spans and events."""
     st.subheader("Execution Timeline")
 
-    spans = trace.get("spans", [])
-    for span in spans:
-        duration = span.get("duration_ms", 0)
-        with st.expander(f"{span['name']} ({duration:.0f}ms)", expanded=False):
-            events = span.get("events", [])
-            for event in events:
-                event_type = event.get("event_type", "unknown")
-                data = event.get("data", {})
+    # Hoist lookups out of the per-event loop; for traces with thousands
+    # of events the repeated LOAD_GLOBAL/LOAD_ATTR dispatch adds up.
+    get_renderer = _RENDERERS.get
+    default = _render_default
+    expander = st.expander
 
-                if event_type == "thought":
-                    st.markdown(f"**Thought:** {data.get('text', '')}")
-                elif event_type == "tool_call":
-                    st.code(f"Tool: {data.get('tool', '')} | Input: {json.dumps(data.get('input', {}), indent=2)}")
-                elif event_type == "tool_result":
-                    status = "OK" if data.get("success") else "FAIL"
-                    st.markdown(f"**Result [{status}]:** {data.get('output_length', 0)} chars")
-                    if data.get("error"):
-                        st.error(data["error"])
-                elif event_type == "llm_request":
-                    st.markdown(f"**LLM Request:** {data.get('model', '')} ({data.get('message_count', 0)} messages)")
-                elif event_type == "llm_response":
-                    tokens = f"{data.get('input_tokens', 0)}/{data.get('output_tokens', 0)}"
-                    st.markdown(f"**LLM Response:** {tokens} tokens, stop={data.get('stop_reason', '')}")
-                elif event_type == "cache_hit":
-                    st.success(f"Cache hit! Similarity: {data.get('similarity', 0):.2f}, Saved: ${data.get('saved_cost', 0):.4f}")
-                elif event_type == "cache_miss":
-                    st.info(f"Cache miss (best score: {data.get('best_score', 0):.2f})")
-                elif event_type == "critic_check":
-                    if data.get("passed"):
-                        st.success(f"Verification passed ({data.get('total_checks', 0)} checks)")
-                    else:
-                        st.error(f"Verification failed: {data.get('summary', '')}")
-                elif event_type == "budget_warning":
-                    st.warning(f"Budget warning: {data.get('error', '')}")
-                elif event_type == "error":
-                    st.error(f"Error: {data.get('error', '')}")
-                else:
-                    st.json(data)
+    for span in trace.get("spans", []):
+        duration = span.get("duration_ms", 0)
+        with expander(f"{span['name']} ({duration:.0f}ms)", expanded=False):
+            for event in span.get("events", []):
+                get_renderer(event.get("event_type", "unknown"), default)(event.get("data", {}))
 
 
+@st.fragment
 def render_cost_breakdown(trace: dict) -> None:
     """Render cost analysis from trace events."""
     st.subheader("Cost Breakdown")
 
-    spans = trace.get("spans", [])
-    total_input = 0
-    total_output = 0
-    api_calls = 0
-
-    for span in spans:
-        for event in span.get("events", []):
-            if event["event_type"] == "llm_response":
-                data = event["data"]
-                total_input += data.get("input_tokens", 0)
-                total_output += data.get("output_tokens", 0)
-                api_calls += 1
+    summary = trace.get("_summary") or _summarize(trace)
 
     col1, col2, col3 = st.columns(3)
-    col1.metric("API Calls", api_calls)
-    col2.metric("Input Tokens", f"{total_input:,}")
-    col3.metric("Output Tokens", f"{total_output:,}")
+    col1.metric("API Calls", summary["api_calls"])
+    col2.metric("Input Tokens", f"{summary['total_input']:,}")
+    col3.metric("Output Tokens", f"{summary['total_output']:,}")
 
 
+@st.fragment
 def render_tool_usage(trace: dict) -> None:
     """Render tool usage statistics."""
     st.subheader("Tool Usage")
 
-    tool_counts: dict[str, int] = {}
-    tool_success: dict[str, int] = {}
-
-    spans = trace.get("spans", [])
-    for span in spans:
-        for event in span.get("events", []):
-            if event["event_type"] == "tool_call":
-                name = event["data"].get("tool", "unknown")
-                tool_counts[name] = tool_counts.get(name, 0) + 1
-            elif event["event_type"] == "tool_result":
-                name = event["data"].get("tool", "unknown")
-                if event["data"].get("success"):
-                    tool_success[name] = tool_success.get(name, 0) + 1
+    summary = trace.get("_summary") or _summarize(trace)
+    tool_counts = summary["tool_counts"]
+    tool_success = summary["tool_success"]
 
-    if tool_counts:
-        for tool, count in sorted(tool_counts.items(), key=lambda x: x[1], reverse=True):
-            success = tool_success.get(tool, 0)
-            st.progress(success / count if count > 0 else 0, text=f"{tool}: {count} calls ({success} OK)")
-    else:
+    if not tool_counts:
         st.info("No tool calls in this trace")
+        return
+
+    # One dataframe payload to the browser instead of a widget per tool.
+    df = pd.DataFrame(
+        {
+            "tool": list(tool_counts),
+            "calls": list(tool_counts.values()),
+            "ok": [tool_success.get(tool, 0) for tool in tool_counts],
+        }
+    )
+    df["rate"] = df["ok"] / df["calls"]
+    df = df.sort_values("calls", ascending=False)
+
+    st.bar_chart(df.set_index("tool")[["calls", "ok"]])
+    st.dataframe(df, hide_index=True, use_container_width=True)
 
 
 def main():
     """Main dashboard entry point."""
     trace_dir = st.sidebar.text_input("Trace directory", value="data/traces")
-    traces = load_traces(trace_dir)
-    selected = render_sidebar(traces)
+    index = load_trace_index(trace_dir)
+    selected = render_sidebar(index)
 
     if selected:
         render_overview(selected)
@@ -6,6 +6,8 @@ The Fibonacci sequence starts with 0 and 1, and each subsequent number is the su
 of the two preceding ones: 0, 1, 1, 2, 3, 5, 8, 13, 21, 34, ...
 """
 
+import functools
+
 
 def fibonacci_iterative(n):
     """
@@ -21,30 +23,48 @@ def fibonacci_iterative(n):
         return []
     elif n == 1:
         return [0]
-    elif n == 2:
-        return [0, 1]
-    
-    fib_sequence = [0, 1]
+
+    # Preallocate the result and run the recurrence on two locals so each
+    # step is a single tuple swap plus a store -- no list resizing and no
+    # subscript reads of the previous two entries.
+    fib_sequence = [0] * n
+    fib_sequence[1] = 1
+    a, b = 0, 1
     for i in range(2, n):
-        next_fib = fib_sequence[i-1] + fib_sequence[i-2]
-        fib_sequence.append(next_fib)
-    
+        a, b = b, a + b
+        fib_sequence[i] = b
+
     return fib_sequence
 
 
 def fibonacci_recursive(n):
     """
-    Calculate the nth Fibonacci number using recursion.
-    
+    Calculate the nth Fibonacci number using fast doubling.
+
+    Walks the bits of n from most to least significant, applying the
+    identities F(2k) = F(k) * (2*F(k+1) - F(k)) and
+    F(2k+1) = F(k)^2 + F(k+1)^2, so the cost is O(log n) multiplications
+    instead of the exponential blowup of naive recursion.
+
     Args:
         n (int): Position in the Fibonacci sequence (0-indexed)
-        
+
     Returns:
         int: The nth Fibonacci number
     """
     if n <= 1:
-        return n
-    return fibonacci_recursive(n-1) + fibonacci_recursive(n-2)
+        return max(n, 0)
+
+    a, b = 0, 1  # F(0), F(1)
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)  # F(2k)
+        d = a * a + b * b    # F(2k+1)
+        if bit == "0":
+            a, b = c, d
+        else:
+            a, b = d, c + d
+
+    return a
 
 
 def fibonacci_generator(n):
@@ -63,25 +83,48 @@ def fibonacci_generator(n):
         a, b = b, a + b
 
 
-def fibonacci_memoized(n, memo={}):
+@functools.lru_cache(maxsize=None)
+def fibonacci_memoized(n):
     """
     Calculate the nth Fibonacci number using memoization for efficiency.
-    
+
+    The cache lives in the lru_cache wrapper (implemented in C), so lookups
+    avoid a Python-level dict check and the cache can be dropped explicitly
+    via ``fibonacci_memoized.cache_clear()``.
+
     Args:
         n (int): Position in the Fibonacci sequence (0-indexed)
-        memo (dict): Memoization dictionary to store computed values
-        
+
     Returns:
         int: The nth Fibonacci number
     """
-    if n in memo:
-        return memo[n]
-    
     if n <= 1:
         return n
-    
-    memo[n] = fibonacci_memoized(n-1, memo) + fibonacci_memoized(n-2, memo)
-    return memo[n]
+
+    return fibonacci_memoized(n-1) + fibonacci_memoized(n-2)
+
+
+_PHI = (1 + 5 ** 0.5) / 2
+_SQRT5 = 5 ** 0.5
+
+
+def fibonacci_fast(n):
+    """
+    Calculate the nth Fibonacci number, picking the cheapest algorithm.
+
+    For n <= 70 the result fits exactly in a float64 mantissa, so Binet's
+    closed form round(phi**n / sqrt(5)) gives the answer in O(1). Larger n
+    falls back to the exact big-int fast-doubling routine.
+
+    Args:
+        n (int): Position in the Fibonacci sequence (0-indexed)
+
+    Returns:
+        int: The nth Fibonacci number
+    """
+    if n <= 70:
+        return round(_PHI ** max(n, 0) / _SQRT5)
+    return fibonacci_recursive(n)
 
 
 def main():
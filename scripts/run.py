@@ -10,29 +10,24 @@ import uuid
 # Ensure project root is on Python path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-
-from src.agent.loop import AgentLoop
-from src.code.repo_map import RepoMapBuilder
-from src.config import load_config, setup_logging
-from src.cost.tracker import CostTracker
-from src.llm.client import LLMClient
-from src.memory.working import WorkingMemory
-from src.tools.code import ASTCheckTool, LintTool, TestRunnerTool
-from src.tools.filesystem import GlobTool, ListDirectoryTool, ReadFileTool, WriteFileTool
-from src.tools.git import GitCommitTool, GitDiffTool, GitLogTool, GitStatusTool
-from src.tools.registry import ToolRegistry
-from src.tools.search import GrepTool
-from src.tools.shell import ShellTool
-from src.trace.collector import TraceCollector
-
-console = Console()
-
-
-def build_tool_registry(settings, trace_collector) -> ToolRegistry:
+# Heavy dependencies (rich, anthropic, tree-sitter, ...) are imported inside
+# the functions that need them so `--help` and argparse errors stay fast.
+
+
+def build_tool_registry(settings, trace_collector):
     """Register all available tools."""
+    from src.tools.code import ASTCheckTool, LintTool, TestRunnerTool
+    from src.tools.filesystem import (
+        GlobTool,
+        ListDirectoryTool,
+        ReadFileTool,
+        WriteFileTool,
+    )
+    from src.tools.git import GitCommitTool, GitDiffTool, GitLogTool, GitStatusTool
+    from src.tools.registry import ToolRegistry
+    from src.tools.search import GrepTool
+    from src.tools.shell import ShellTool
+
     registry = ToolRegistry(trace_collector=trace_collector)
 
     # Filesystem tools
@@ -63,6 +58,9 @@ def build_tool_registry(settings, trace_collector) -> ToolRegistry:
 
 def display_result(result, cost_tracker, console):
     """Display the agent result with rich formatting."""
+    from rich.panel import Panel
+    from rich.table import Table
+
     # Response panel
     console.print()
     console.print(
@@ -90,8 +88,13 @@ def display_result(result, cost_tracker, console):
     console.print(table)
 
 
-def run_interactive(settings, llm_client, tool_registry, cost_tracker, trace_collector):
+def run_interactive(settings, llm_client, tool_registry, cost_tracker, trace_collector, console):
     """Run in interactive REPL mode."""
+    from rich.panel import Panel
+
+    from src.agent.loop import AgentLoop
+    from src.memory.working import WorkingMemory
+
     working_memory = WorkingMemory(max_items=settings.memory.max_working_items)
     status_handle = None
 
@@ -140,8 +143,12 @@ def run_interactive(settings, llm_client, tool_registry, cost_tracker, trace_col
         console.print()
 
 
-def run_single(task, settings, llm_client, tool_registry, cost_tracker, trace_collector):
+def run_single(task, settings, llm_client, tool_registry, cost_tracker, trace_collector, console):
     """Run a single task and exit."""
+    from src.agent.loop import AgentLoop
+    from src.code.repo_map import RepoMapBuilder
+    from src.memory.working import WorkingMemory
+
     working_memory = WorkingMemory(max_items=settings.memory.max_working_items)
 
     # Build repo context
@@ -181,6 +188,15 @@ def main():
     parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging")
     args = parser.parse_args()
 
+    from rich.console import Console
+
+    from src.config import load_config, setup_logging
+    from src.cost.tracker import CostTracker
+    from src.llm.client import LLMClient
+    from src.trace.collector import TraceCollector
+
+    console = Console()
+
     # Load configuration
     settings = load_config(args.config)
     if args.verbose:
@@ -212,11 +228,13 @@ def main():
 
     if args.task:
         exit_code = run_single(
-            args.task, settings, llm_client, tool_registry, cost_tracker, trace_collector
+            args.task, settings, llm_client, tool_registry, cost_tracker, trace_collector, console
         )
         sys.exit(exit_code)
     else:
-        run_interactive(settings, llm_client, tool_registry, cost_tracker, trace_collector)
+        run_interactive(
+            settings, llm_client, tool_registry, cost_tracker, trace_collector, console
+        )
 
 
 if __name__ == "__main__":
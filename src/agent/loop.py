@@ -35,7 +35,7 @@ Guidelines:
 """
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentResult:
     """Result of an agent task execution."""
 
@@ -60,6 +60,14 @@ class AgentLoop:
     Integrates working memory, cost tracking, and trace collection.
     """
 
+    # Per-tool status-line detail formatters; O(1) lookup per tool call.
+    _TOOL_DETAIL = {
+        "read_file": lambda i: f" → {i.get('path', '')}",
+        "write_file": lambda i: f" → {i.get('path', '')}",
+        "grep": lambda i: f" → '{i.get('pattern', '')}'",
+        "shell": lambda i: f" → {i.get('command', '')[:40]}",
+    }
+
     def __init__(
         self,
         settings: Settings,
@@ -77,6 +85,20 @@ class AgentLoop:
         self.trace = trace_collector
         self.memory = working_memory or WorkingMemory(max_items=settings.memory.max_working_items)
         self._on_status = on_status or (lambda msg: None)
+        self._system_cache: tuple[tuple[int, str], str] | None = None
+
+    def _build_system_prompt(self, context: str) -> str:
+        """Format the system prompt, reusing the cached string when neither
+        working memory nor the extra context has changed since the last task."""
+        key = (self.memory.version, context)
+        if self._system_cache and self._system_cache[0] == key:
+            return self._system_cache[1]
+
+        system = SYSTEM_PROMPT.format(working_memory=self.memory.to_context_string())
+        if context:
+            system += f"\n\nContext:\n{context}"
+        self._system_cache = (key, system)
+        return system
 
     def run(self, task: str, context: str = "") -> AgentResult:
         """Execute a task through the ReAct loop.
@@ -90,12 +112,12 @@ class AgentLoop:
         """
         start_time = time.time()
         tool_calls_made: list[str] = []
-        files_modified: list[str] = []
+        tool_calls_append = tool_calls_made.append
+        # Insertion-ordered set: O(1) dedup instead of a linear `not in` scan.
+        files_modified: dict[str, None] = {}
 
         # Build system prompt with working memory
-        system = SYSTEM_PROMPT.format(working_memory=self.memory.to_context_string())
-        if context:
-            system += f"\n\nContext:\n{context}"
+        system = self._build_system_prompt(context)
 
         conversation = Conversation(system_prompt=system)
         conversation.add_user_message(task)
@@ -127,23 +149,16 @@ class AgentLoop:
                 # If no tool calls, we're done
                 if not response.has_tool_calls:
                     final_response = response.text
-                    if span:
-                        self.trace.end_span(span)
                     break
 
                 # Execute tool calls
                 tool_results: list[ToolResultContent] = []
                 for tool_call in response.tool_calls:
-                    tool_calls_made.append(tool_call.name)
+                    tool_calls_append(tool_call.name)
 
                     # Show what tool is being used
-                    tool_detail = ""
-                    if tool_call.name in ("read_file", "write_file"):
-                        tool_detail = f" → {tool_call.input.get('path', '')}"
-                    elif tool_call.name == "grep":
-                        tool_detail = f" → '{tool_call.input.get('pattern', '')}'"
-                    elif tool_call.name == "shell":
-                        tool_detail = f" → {tool_call.input.get('command', '')[:40]}"
+                    formatter = self._TOOL_DETAIL.get(tool_call.name)
+                    tool_detail = formatter(tool_call.input) if formatter else ""
                     self._on_status(f"Using {tool_call.name}{tool_detail}")
 
                     result = self.tools.execute(tool_call.name, tool_call.input)
@@ -151,8 +166,8 @@ class AgentLoop:
                     # Track file modifications
                     if tool_call.name == "write_file" and result.success:
                         path = tool_call.input.get("path", "")
-                        if path and path not in files_modified:
-                            files_modified.append(path)
+                        if path:
+                            files_modified.setdefault(path, None)
 
                     # Update working memory with recent tool result
                     self.memory.set(
@@ -180,8 +195,6 @@ class AgentLoop:
                 final_response = (
                     f"Task stopped: budget exceeded (${e.spent:.4f} of ${e.budget:.4f})"
                 )
-                if span:
-                    self.trace.end_span(span)
                 break
 
             except Exception as e:
@@ -189,11 +202,10 @@ class AgentLoop:
                 if self.trace:
                     self.trace.record(EventType.ERROR, {"error": str(e)})
                 final_response = f"Agent encountered an error: {e}"
-                if span:
-                    self.trace.end_span(span)
                 break
 
             finally:
+                # Single close point for the span, whatever path we took.
                 if span and span.end_time is None:
                     self.trace.end_span(span)
 
@@ -208,7 +220,7 @@ class AgentLoop:
             response=final_response,
             iterations=min(iteration + 1, max_iterations),
             tool_calls_made=tool_calls_made,
-            files_modified=files_modified,
+            files_modified=list(files_modified),
             total_tokens=cost_summary["total_tokens"],
             total_cost_usd=cost_summary["total_cost_usd"],
             duration_seconds=round(duration, 2),
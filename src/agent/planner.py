@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import logging
+import re
+from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -14,7 +16,13 @@ from src.trace.models import EventType
 
 logger = logging.getLogger(__name__)
 
-PLANNER_PROMPT = """You are a task planner for an AI coding agent. Given a complex task,
+# Matches "1. step" / "2) step" lines in LLM plan output.
+_STEP_RE = re.compile(r"^\s*(\d+)[.)]\s*(.+)$", re.MULTILINE)
+
+
+# Static rule block — formatted once per Planner so it stays byte-identical
+# across calls and can be served from the provider's prompt cache.
+PLANNER_RULES_PREFIX = """You are a task planner for an AI coding agent. Given a complex task,
 decompose it into a sequence of concrete, actionable steps.
 
 Rules:
@@ -28,8 +36,9 @@ Output format — return ONLY a numbered list, one step per line:
 1. First step description
 2. Second step description
 ...
+"""
 
-Task: {task}
+PLANNER_TASK_SUFFIX = """Task: {task}
 
 Context: {context}
 """
@@ -45,6 +54,15 @@ class StepStatus(str, Enum):
     SKIPPED = "skipped"
 
 
+_STATUS_ICON: dict[StepStatus, str] = {
+    StepStatus.PENDING: "[ ]",
+    StepStatus.IN_PROGRESS: "[>]",
+    StepStatus.COMPLETED: "[x]",
+    StepStatus.FAILED: "[!]",
+    StepStatus.SKIPPED: "[-]",
+}
+
+
 @dataclass
 class PlanStep:
     """A single step in the execution plan."""
@@ -58,54 +76,80 @@ class PlanStep:
 
 @dataclass
 class ExecutionPlan:
-    """A decomposed plan for executing a complex task."""
+    """A decomposed plan for executing a complex task.
+
+    Status queries (current_step, is_complete, progress_summary) read
+    incrementally maintained counters instead of rescanning the step list,
+    so they stay O(1) however often the UI refreshes. Use update_status
+    to change a step's status; writing step.status directly bypasses the
+    counters.
+    """
 
     task: str
     steps: list[PlanStep] = field(default_factory=list)
     failure_count: int = 0
 
+    def __post_init__(self) -> None:
+        self._counts: dict[StepStatus, int] = dict.fromkeys(StepStatus, 0)
+        for step in self.steps:
+            self._counts[step.status] += 1
+        self._pending: deque[int] = deque(
+            pos for pos, step in enumerate(self.steps) if step.status == StepStatus.PENDING
+        )
+
+    def update_status(self, step_index: int, new_status: StepStatus) -> None:
+        """Transition a step (by its index field) to a new status in O(1)."""
+        for pos, step in enumerate(self.steps):
+            if step.index == step_index:
+                self._counts[step.status] -= 1
+                self._counts[new_status] += 1
+                step.status = new_status
+                if new_status == StepStatus.PENDING:
+                    self._pending.append(pos)
+                return
+        raise ValueError(f"No step with index {step_index}")
+
     @property
     def current_step(self) -> PlanStep | None:
         """Get the next pending step."""
-        for step in self.steps:
+        pending = self._pending
+        while pending:
+            step = self.steps[pending[0]]
             if step.status == StepStatus.PENDING:
                 return step
+            # Step was transitioned since being queued; drop it lazily.
+            pending.popleft()
         return None
 
     @property
     def is_complete(self) -> bool:
         """Check if all steps are done (completed, failed, or skipped)."""
-        return all(
-            s.status in (StepStatus.COMPLETED, StepStatus.FAILED, StepStatus.SKIPPED)
-            for s in self.steps
+        return (
+            self._counts[StepStatus.PENDING] == 0
+            and self._counts[StepStatus.IN_PROGRESS] == 0
         )
 
     @property
     def progress_summary(self) -> str:
         """Human-readable progress summary."""
-        completed = sum(1 for s in self.steps if s.status == StepStatus.COMPLETED)
-        failed = sum(1 for s in self.steps if s.status == StepStatus.FAILED)
-        total = len(self.steps)
-        return f"Progress: {completed}/{total} completed, {failed} failed"
+        completed = self._counts[StepStatus.COMPLETED]
+        failed = self._counts[StepStatus.FAILED]
+        return f"Progress: {completed}/{len(self.steps)} completed, {failed} failed"
 
     def to_context_string(self) -> str:
         """Render plan as context for the agent."""
-        lines = [f"Execution Plan for: {self.task}", ""]
-        for step in self.steps:
-            status_icon = {
-                StepStatus.PENDING: "[ ]",
-                StepStatus.IN_PROGRESS: "[>]",
-                StepStatus.COMPLETED: "[x]",
-                StepStatus.FAILED: "[!]",
-                StepStatus.SKIPPED: "[-]",
-            }[step.status]
-            lines.append(f"{status_icon} {step.index}. {step.description}")
-            if step.result:
-                lines.append(f"    Result: {step.result[:100]}")
-            if step.error:
-                lines.append(f"    Error: {step.error[:100]}")
-
-        return "\n".join(lines)
+
+        def render_lines():
+            yield f"Execution Plan for: {self.task}"
+            yield ""
+            for step in self.steps:
+                yield f"{_STATUS_ICON[step.status]} {step.index}. {step.description}"
+                if step.result:
+                    yield f"    Result: {step.result[:100]}"
+                if step.error:
+                    yield f"    Error: {step.error[:100]}"
+
+        return "\n".join(render_lines())
 
 
 class Planner:
@@ -124,6 +168,7 @@ class Planner:
         self.config = config
         self.llm = llm_client
         self.trace = trace_collector
+        self._rules_prefix = PLANNER_RULES_PREFIX.format(max_steps=config.max_plan_steps)
 
     def create_plan(self, task: str, context: str = "") -> ExecutionPlan:
         """Generate an execution plan for a complex task.
@@ -135,13 +180,12 @@ class Planner:
         Returns:
             ExecutionPlan with ordered steps.
         """
-        prompt = PLANNER_PROMPT.format(
-            max_steps=self.config.max_plan_steps,
+        prompt = PLANNER_TASK_SUFFIX.format(
             task=task,
             context=context or "(no additional context)",
         )
 
-        conversation = Conversation(system_prompt="You are a precise task planner.")
+        conversation = Conversation(cached_system_prefix=self._rules_prefix)
         conversation.add_user_message(prompt)
 
         response = self.llm.chat(conversation, max_tokens_override=1024)
@@ -201,13 +245,8 @@ class Planner:
     @staticmethod
     def _parse_steps(text: str) -> list[PlanStep]:
         """Parse numbered steps from LLM output."""
-        import re
-
-        steps = []
-        for match in re.finditer(r"^\s*(\d+)[.)]\s*(.+)$", text, re.MULTILINE):
-            idx = int(match.group(1))
-            description = match.group(2).strip()
-            if description:
-                steps.append(PlanStep(index=idx, description=description))
-
-        return steps
+        return [
+            PlanStep(index=int(number), description=description.strip())
+            for number, description in _STEP_RE.findall(text)
+            if description.strip()
+        ]
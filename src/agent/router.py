@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import hashlib
 import logging
 import re
 from dataclasses import dataclass
@@ -48,6 +49,49 @@ SIMPLE_KEYWORDS = {
     "find",
 }
 
+# Pre-compiled patterns; route() is called for every task.
+_FILE_REF_RE = re.compile(r"[\w/]+\.\w{1,4}")
+_STEP_INDICATOR_RE = re.compile(r"(?:then|after that|next|also|and then|finally)")
+
+
+def _build_keyword_automaton():
+    """Build a multi-pattern automaton over both keyword sets, if available.
+
+    A single Aho-Corasick pass over the task replaces one substring probe
+    per keyword; falls back to the per-keyword scan when pyahocorasick
+    isn't installed.
+    """
+    try:
+        import ahocorasick
+    except ImportError:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for kw in COMPLEX_KEYWORDS:
+        automaton.add_word(kw, ("complex", kw))
+    for kw in SIMPLE_KEYWORDS:
+        automaton.add_word(kw, ("simple", kw))
+    automaton.make_automaton()
+    return automaton
+
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton()
+
+
+def _match_keywords(task_lower: str) -> tuple[list[str], list[str]]:
+    """Return (complex_matches, simple_matches) found in the task."""
+    if _KEYWORD_AUTOMATON is not None:
+        complex_hits: set[str] = set()
+        simple_hits: set[str] = set()
+        for _end, (category, kw) in _KEYWORD_AUTOMATON.iter(task_lower):
+            (complex_hits if category == "complex" else simple_hits).add(kw)
+        return sorted(complex_hits), sorted(simple_hits)
+
+    return (
+        sorted(kw for kw in COMPLEX_KEYWORDS if kw in task_lower),
+        sorted(kw for kw in SIMPLE_KEYWORDS if kw in task_lower),
+    )
+
 
 class TaskComplexity(str, Enum):
     """Task complexity classification."""
@@ -81,8 +125,13 @@ class ComplexityRouter:
     Complex tasks → decomposition via Planner, then step-by-step execution
     """
 
+    # Bound on the per-router decision memo; cleared wholesale when full.
+    _ROUTE_CACHE_MAX = 256
+
     def __init__(self, config: PlannerConfig) -> None:
         self.config = config
+        # ReAct debugging loops re-route identical tasks; memoize by digest.
+        self._route_cache: dict[bytes, RoutingDecision] = {}
 
     def route(self, task: str) -> RoutingDecision:
         """Classify task complexity and decide execution strategy.
@@ -93,25 +142,29 @@ class ComplexityRouter:
         Returns:
             RoutingDecision with complexity level and reasoning.
         """
+        cache_key = hashlib.blake2b(task.encode(), digest_size=16).digest()
+        cached = self._route_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         score = 0.0
         reasons = []
 
+        # Normalize once; every check below reads these.
         task_lower = task.lower()
+        word_count = len(task.split())
 
-        # Check for complex keywords
-        complex_matches = [kw for kw in COMPLEX_KEYWORDS if kw in task_lower]
+        # Check keywords with one pass over the task
+        complex_matches, simple_matches = _match_keywords(task_lower)
         if complex_matches:
             score += 0.3 * len(complex_matches)
             reasons.append(f"Complex keywords: {', '.join(complex_matches)}")
 
-        # Check for simple keywords
-        simple_matches = [kw for kw in SIMPLE_KEYWORDS if kw in task_lower]
         if simple_matches:
             score -= 0.3 * len(simple_matches)
             reasons.append(f"Simple keywords: {', '.join(simple_matches)}")
 
         # Task length (longer tasks tend to be more complex)
-        word_count = len(task.split())
         if word_count > 50:
             score += 0.2
             reasons.append(f"Long task description ({word_count} words)")
@@ -119,20 +172,34 @@ class ComplexityRouter:
             score -= 0.2
             reasons.append(f"Short task description ({word_count} words)")
 
-        # Count file references
-        file_refs = re.findall(r"[\w/]+\.\w{1,4}", task)
-        if len(file_refs) > 2:
-            score += 0.2
-            reasons.append(f"Multiple file references ({len(file_refs)})")
-
-        # Multi-step indicators
-        step_indicators = re.findall(r"(?:then|after that|next|also|and then|finally)", task_lower)
-        if step_indicators:
-            score += 0.15 * len(step_indicators)
-            reasons.append(f"Multi-step indicators ({len(step_indicators)})")
-
-        # Normalize to [0, 1]
-        score = max(0.0, min(1.0, score + 0.5))
+        # The remaining signals only add to the score: file references
+        # contribute at most 0.2, and each step indicator spans at least
+        # one word, so indicators add at most 0.15 * word_count. When
+        # neither bound can move the score across the threshold, the
+        # classification is already decided and both regex scans can be
+        # skipped — which is exactly the short, simple tasks that get
+        # routed most often.
+        threshold = self.config.complexity_threshold
+        min_score = max(0.0, min(1.0, score + 0.5))
+        max_score = max(0.0, min(1.0, score + 0.5 + 0.2 + 0.15 * word_count))
+
+        if min_score >= threshold or max_score < threshold:
+            score = min_score
+        else:
+            # Count file references
+            file_refs = _FILE_REF_RE.findall(task)
+            if len(file_refs) > 2:
+                score += 0.2
+                reasons.append(f"Multiple file references ({len(file_refs)})")
+
+            # Multi-step indicators
+            step_indicators = _STEP_INDICATOR_RE.findall(task_lower)
+            if step_indicators:
+                score += 0.15 * len(step_indicators)
+                reasons.append(f"Multi-step indicators ({len(step_indicators)})")
+
+            # Normalize to [0, 1]
+            score = max(0.0, min(1.0, score + 0.5))
 
         complexity = (
             TaskComplexity.COMPLEX
@@ -153,4 +220,7 @@ class ComplexityRouter:
             decision.confidence,
         )
 
+        if len(self._route_cache) >= self._ROUTE_CACHE_MAX:
+            self._route_cache.clear()
+        self._route_cache[cache_key] = decision
         return decision
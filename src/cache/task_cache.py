@@ -2,13 +2,18 @@
 
 from __future__ import annotations
 
+import functools
 import json
 import logging
+import os
+import re
 import sqlite3
 from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import numpy as np
+if TYPE_CHECKING:
+    import numpy as np
 
 from src.config import CacheConfig
 from src.trace.collector import TraceCollector
@@ -17,6 +22,18 @@ from src.trace.models import EventType
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
+def _get_shared_model():
+    """Load the embedding model once per process, shared across instances."""
+    try:
+        from sentence_transformers import SentenceTransformer
+
+        return SentenceTransformer("all-MiniLM-L6-v2")
+    except ImportError:
+        logger.warning("sentence-transformers not available for cache embeddings")
+        return None
+
+
 @dataclass
 class CachedChain:
     """A cached tool chain from a previously successful task."""
@@ -50,20 +67,60 @@ class TaskCache:
         self.trace = trace_collector
         self._model = None
         self._dimension = 384
-
-        # SQLite storage for cached chains
         self.db_path = Path(config.db_path)
+        self._conn: sqlite3.Connection | None = None
+        self._size = 0
+        self._row_count = 0
+        self._ann = None
+
+        # Storage (sqlite + numpy index) is only brought up when caching is
+        # actually on, so a disabled cache costs neither the numpy import
+        # nor a database connection at startup.
+        if config.enabled:
+            self._init_storage()
+
+    def _init_storage(self) -> None:
+        """Open the database and map the embedding index."""
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._conn = sqlite3.connect(str(self.db_path))
+        # WAL avoids the rollback-journal double write on every commit;
+        # mmap serves reads from mapped pages instead of read() syscalls.
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA mmap_size=268435456")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
         self._create_table()
 
-        # In-memory embedding index
-        self._embeddings: list[np.ndarray] = []
+        # Embedding index: one contiguous (capacity, dim) matrix grown by
+        # doubling, so lookup is a single matmul on a view instead of an
+        # np.stack copy per query. Rows are int8-quantized, which quarters
+        # the memory traffic of the scan; vectors are L2-normalized so a
+        # fixed symmetric scale of 1/127 loses almost no precision. The
+        # matrix is a memory-mapped .npy sidecar of the database: startup
+        # maps the whole thing in O(1) instead of materializing N per-row
+        # BLOBs, and pages are shared across processes.
+        self._emb_path = self.db_path.with_suffix(".npy")
+        self._capacity = 64
+        self._size = 0
         self._chain_ids: list[int] = []
+        self._id_to_row: dict[int, int] = {}
         self._load_embeddings()
+        self._row_count = self._conn.execute(
+            "SELECT COUNT(*) FROM task_chains"
+        ).fetchone()[0]
+
+        # Approximate nearest-neighbor index, built only once the corpus is
+        # big enough that the exact scan stops being effectively free.
+        if self.config.ann_enabled and self._size > self._ANN_THRESHOLD:
+            self._build_ann()
+
+    # Minimum lexical candidates needed before we trust the BM25 prefilter;
+    # below this we fall back to the full dense scan to preserve recall.
+    _FTS_MIN_CANDIDATES = 8
+    _FTS_LIMIT = 64
 
     def _create_table(self) -> None:
-        """Create cache table."""
+        """Create cache table and the FTS5 mirror used to prefilter lookups."""
         self._conn.execute("""
             CREATE TABLE IF NOT EXISTS task_chains (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -72,39 +129,259 @@ class TaskCache:
                 files_modified TEXT NOT NULL,
                 cost_usd REAL,
                 hit_count INTEGER DEFAULT 0,
-                embedding BLOB
+                emb_row INTEGER
             )
         """)
+        # Lets the eviction query find the least-used row by index range
+        # scan instead of sorting the whole table.
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_task_chains_hit_count ON task_chains(hit_count)"
+        )
+        try:
+            fts_existed = (
+                self._conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type='table' AND name='task_chains_fts'"
+                ).fetchone()
+                is not None
+            )
+            self._conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS task_chains_fts USING fts5(
+                    task_description,
+                    content='task_chains',
+                    content_rowid='id'
+                )
+            """)
+            self._conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS task_chains_ai AFTER INSERT ON task_chains BEGIN
+                    INSERT INTO task_chains_fts(rowid, task_description)
+                    VALUES (new.id, new.task_description);
+                END
+            """)
+            self._conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS task_chains_ad AFTER DELETE ON task_chains BEGIN
+                    INSERT INTO task_chains_fts(task_chains_fts, rowid, task_description)
+                    VALUES ('delete', old.id, old.task_description);
+                END
+            """)
+            self._conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS task_chains_au AFTER UPDATE ON task_chains BEGIN
+                    INSERT INTO task_chains_fts(task_chains_fts, rowid, task_description)
+                    VALUES ('delete', old.id, old.task_description);
+                    INSERT INTO task_chains_fts(rowid, task_description)
+                    VALUES (new.id, new.task_description);
+                END
+            """)
+            if not fts_existed:
+                # Index any rows that predate the FTS mirror; the delete
+                # triggers misfire against an empty external-content index.
+                self._conn.execute(
+                    "INSERT INTO task_chains_fts(task_chains_fts) VALUES ('rebuild')"
+                )
+            self._fts_enabled = True
+        except sqlite3.OperationalError:
+            logger.info("SQLite FTS5 unavailable; cache lookups use full dense scan")
+            self._fts_enabled = False
         self._conn.commit()
 
+    def _fts_candidate_rows(self, task: str) -> list[int] | None:
+        """Return matrix row indices of BM25 candidates, or None for a full scan."""
+        if not self._fts_enabled:
+            return None
+
+        tokens = [t for t in re.findall(r"\w+", task) if t]
+        if not tokens:
+            return None
+
+        match_expr = " OR ".join(f'"{t}"' for t in tokens[:32])
+        try:
+            rowids = self._conn.execute(
+                "SELECT rowid FROM task_chains_fts WHERE task_chains_fts MATCH ? "
+                "ORDER BY bm25(task_chains_fts) LIMIT ?",
+                (match_expr, self._FTS_LIMIT),
+            ).fetchall()
+        except sqlite3.OperationalError:
+            return None
+
+        rows = [self._id_to_row[rid] for (rid,) in rowids if rid in self._id_to_row]
+        if len(rows) < self._FTS_MIN_CANDIDATES:
+            return None
+        return rows
+
     def _get_model(self):
-        """Lazy-load embedding model."""
+        """Lazy-load the process-wide embedding model."""
         if self._model is None:
-            try:
-                from sentence_transformers import SentenceTransformer
-
-                self._model = SentenceTransformer("all-MiniLM-L6-v2")
+            self._model = _get_shared_model()
+            if self._model is not None:
                 self._dimension = self._model.get_sentence_embedding_dimension()
-            except ImportError:
-                logger.warning("sentence-transformers not available for cache embeddings")
         return self._model
 
     def _embed(self, text: str) -> np.ndarray:
         """Generate embedding for a text."""
+        return self._embed_batch([text])[0]
+
+    def _embed_batch(self, texts: list[str]) -> np.ndarray:
+        """Embed several texts in one forward pass."""
+        import numpy as np
+
         model = self._get_model()
         if model:
-            return model.encode([text], normalize_embeddings=True)[0].astype(np.float32)
-        return np.random.randn(self._dimension).astype(np.float32)
+            return model.encode(
+                texts,
+                normalize_embeddings=True,
+                batch_size=32,
+                convert_to_numpy=True,
+            ).astype(np.float32)
+        return np.random.randn(len(texts), self._dimension).astype(np.float32)
+
+    # Symmetric int8 quantization scale for L2-normalized vectors.
+    _QSCALE = 127
+
+    # Entry count above which lookups switch to the HNSW index.
+    _ANN_THRESHOLD = 2000
+
+    def _dequantize_rows(self) -> np.ndarray:
+        """Return the live matrix rows as float32 unit-ish vectors."""
+        import numpy as np
+
+        return self._matrix[: self._size].astype(np.float32) / self._QSCALE
+
+    def _build_ann(self) -> None:
+        """Build an HNSW index over the current embeddings, if hnswlib exists."""
+        try:
+            import hnswlib
+        except ImportError:
+            logger.info("hnswlib not available; cache lookups stay exact")
+            return
+
+        index = hnswlib.Index(space="cosine", dim=self._dimension)
+        # allow_replace_deleted lets evicted entries free their slots;
+        # without it mark_deleted leaks capacity and add_items raises once
+        # the index fills despite evictions keeping the live count bounded.
+        index.init_index(
+            max_elements=max(self.config.max_entries, self._size),
+            ef_construction=200,
+            M=16,
+            allow_replace_deleted=True,
+        )
+        index.add_items(self._dequantize_rows(), self._chain_ids)
+        self._ann = index
+        logger.debug("Built HNSW index over %d cache entries", self._size)
+
+    @classmethod
+    def _quantize(cls, vector: np.ndarray) -> np.ndarray:
+        """Quantize a normalized float32 vector to int8."""
+        import numpy as np
+
+        return np.clip(np.round(vector * cls._QSCALE), -127, 127).astype(np.int8)
+
+    def _create_memmap(self, capacity: int) -> None:
+        """Create a fresh memory-mapped embedding file of the given capacity."""
+        import numpy as np
+
+        self._matrix = np.lib.format.open_memmap(
+            self._emb_path, mode="w+", dtype=np.int8, shape=(capacity, self._dimension)
+        )
+
+    def _grow(self, min_capacity: int) -> None:
+        """Double the embedding file capacity until it fits min_capacity."""
+        import numpy as np
+
+        while self._capacity < min_capacity:
+            self._capacity *= 2
+        # Regrow into a sibling file and swap it in; the old mapping stays
+        # valid (it follows the inode) until replaced.
+        tmp_path = self._emb_path.with_name(self._emb_path.name + ".tmp")
+        new_matrix = np.lib.format.open_memmap(
+            tmp_path, mode="w+", dtype=np.int8, shape=(self._capacity, self._dimension)
+        )
+        new_matrix[: self._size] = self._matrix[: self._size]
+        os.replace(tmp_path, self._emb_path)
+        self._matrix = new_matrix
+
+    def _append_embedding(self, chain_id: int, embedding: np.ndarray) -> None:
+        """Append an embedding row to the in-memory matrix."""
+        if self._size == self._capacity:
+            self._grow(self._size + 1)
+        self._matrix[self._size] = embedding
+        self._id_to_row[chain_id] = self._size
+        self._size += 1
+        self._chain_ids.append(chain_id)
+
+    def _remove_embedding(self, chain_id: int) -> None:
+        """Drop an embedding row, swapping the last row in to stay dense."""
+        row = self._id_to_row.pop(chain_id, None)
+        if row is None:
+            return
+        last = self._size - 1
+        if row != last:
+            self._matrix[row] = self._matrix[last]
+            moved_id = self._chain_ids[last]
+            self._chain_ids[row] = moved_id
+            self._id_to_row[moved_id] = row
+            self._conn.execute(
+                "UPDATE task_chains SET emb_row = ? WHERE id = ?", (row, moved_id)
+            )
+        self._chain_ids.pop()
+        self._size -= 1
 
     def _load_embeddings(self) -> None:
-        """Load cached embeddings into memory for fast search."""
-        cursor = self._conn.execute("SELECT id, embedding FROM task_chains")
-        for row in cursor.fetchall():
-            chain_id, emb_bytes = row
-            if emb_bytes:
-                emb = np.frombuffer(emb_bytes, dtype=np.float32)
-                self._embeddings.append(emb)
-                self._chain_ids.append(chain_id)
+        """Map the embedding sidecar, migrating legacy per-row BLOBs if present."""
+        import numpy as np
+
+        columns = {
+            row[1] for row in self._conn.execute("PRAGMA table_info(task_chains)")
+        }
+        if "emb_row" not in columns:
+            self._conn.execute("ALTER TABLE task_chains ADD COLUMN emb_row INTEGER")
+
+        if self._emb_path.exists():
+            matrix = np.load(self._emb_path, mmap_mode="r+")
+            rows = self._conn.execute(
+                "SELECT id, emb_row FROM task_chains WHERE emb_row IS NOT NULL "
+                "ORDER BY emb_row"
+            ).fetchall()
+            positions = [pos for _, pos in rows]
+            if (
+                matrix.ndim == 2
+                and matrix.shape[1] == self._dimension
+                and matrix.dtype == np.int8
+                and len(rows) <= matrix.shape[0]
+                and positions == list(range(len(rows)))
+            ):
+                self._matrix = matrix
+                self._capacity = matrix.shape[0]
+                self._chain_ids = [chain_id for chain_id, _ in rows]
+                self._id_to_row = {chain_id: pos for chain_id, pos in rows}
+                self._size = len(rows)
+                return
+            # Sidecar and database disagree; the cache is disposable, so
+            # start cold rather than serving mismatched embeddings.
+            logger.warning("Embedding file out of sync with %s; resetting cache", self.db_path)
+            self._conn.execute("DELETE FROM task_chains")
+
+        self._create_memmap(self._capacity)
+
+        if "embedding" in columns:
+            # Pre-sidecar schema stored one BLOB per row; fold them into
+            # the memmap once and record each row's position.
+            legacy = self._conn.execute(
+                "SELECT id, embedding FROM task_chains WHERE embedding IS NOT NULL"
+            ).fetchall()
+            for chain_id, emb_bytes in legacy:
+                if not emb_bytes:
+                    continue
+                if len(emb_bytes) == self._dimension:
+                    emb = np.frombuffer(emb_bytes, dtype=np.int8)
+                else:
+                    emb = self._quantize(np.frombuffer(emb_bytes, dtype=np.float32))
+                self._append_embedding(chain_id, emb)
+                self._conn.execute(
+                    "UPDATE task_chains SET emb_row = ?, embedding = NULL WHERE id = ?",
+                    (self._id_to_row[chain_id], chain_id),
+                )
+            self._matrix.flush()
+
+        self._conn.commit()
 
     def lookup(self, task: str) -> CachedChain | None:
         """Search for a similar cached task chain.
@@ -115,17 +392,56 @@ class TaskCache:
         Returns:
             CachedChain if a similar task is found, None otherwise.
         """
-        if not self.config.enabled or not self._embeddings:
+        if not self.config.enabled or not self._size:
             return None
+        return self._lookup_with_embedding(task, self._embed(task))
 
-        query_emb = self._embed(task)
+    def lookup_batch(self, tasks: list[str]) -> list[CachedChain | None]:
+        """Look up several tasks at once, sharing one embedding forward pass.
 
-        # Cosine similarity search (embeddings are already normalized)
-        embeddings_matrix = np.stack(self._embeddings)
-        similarities = embeddings_matrix @ query_emb
+        Args:
+            tasks: Task descriptions to search for.
 
-        best_idx = int(np.argmax(similarities))
-        best_score = float(similarities[best_idx])
+        Returns:
+            One CachedChain or None per task, in input order.
+        """
+        if not self.config.enabled or not self._size or not tasks:
+            return [None] * len(tasks)
+
+        embeddings = self._embed_batch(tasks)
+        return [
+            self._lookup_with_embedding(task, embeddings[i])
+            for i, task in enumerate(tasks)
+        ]
+
+    def _lookup_with_embedding(self, task: str, query_emb: np.ndarray) -> CachedChain | None:
+        """Run the similarity search for one task given its embedding."""
+        import numpy as np
+
+        # Cosine similarity search (embeddings are already normalized);
+        # restrict the dense scan to BM25 candidates when enough exist,
+        # otherwise scan the full matrix view in one matmul.
+        if self._ann is not None:
+            labels, distances = self._ann.knn_query(
+                np.ascontiguousarray(query_emb, dtype=np.float32), k=1
+            )
+            chain_id = int(labels[0][0])
+            best_score = 1.0 - float(distances[0][0])
+        else:
+            query_q = self._quantize(query_emb).astype(np.int32)
+            inv_scale = 1.0 / (self._QSCALE * self._QSCALE)
+
+            candidate_rows = self._fts_candidate_rows(task)
+            if candidate_rows is not None:
+                scores = self._matrix[candidate_rows].astype(np.int32) @ query_q
+                local_best = int(np.argmax(scores))
+                best_idx = candidate_rows[local_best]
+                best_score = float(scores[local_best]) * inv_scale
+            else:
+                scores = self._matrix[: self._size].astype(np.int32) @ query_q
+                best_idx = int(np.argmax(scores))
+                best_score = float(scores[best_idx]) * inv_scale
+            chain_id = self._chain_ids[best_idx]
 
         if best_score < self.config.similarity_threshold:
             if self.trace:
@@ -140,7 +456,6 @@ class TaskCache:
             return None
 
         # Fetch the cached chain
-        chain_id = self._chain_ids[best_idx]
         cursor = self._conn.execute(
             "SELECT task_description, tool_chain, files_modified, cost_usd, hit_count FROM task_chains WHERE id = ?",
             (chain_id,),
@@ -150,10 +465,10 @@ class TaskCache:
             return None
 
         # Increment hit count
-        self._conn.execute(
-            "UPDATE task_chains SET hit_count = hit_count + 1 WHERE id = ?", (chain_id,)
-        )
-        self._conn.commit()
+        with self._conn:
+            self._conn.execute(
+                "UPDATE task_chains SET hit_count = hit_count + 1 WHERE id = ?", (chain_id,)
+            )
 
         cached = CachedChain(
             task_description=row[0],
@@ -202,48 +517,83 @@ class TaskCache:
         if not self.config.enabled:
             return
 
-        # Enforce max entries
-        count = self._conn.execute("SELECT COUNT(*) FROM task_chains").fetchone()[0]
-        if count >= self.config.max_entries:
-            # Evict least-used entry
+        import numpy as np
+
+        embedding = self._quantize(self._embed(task))
+
+        # Eviction, insert, and rowid fetch share one transaction and one
+        # fsync; RETURNING folds the id fetch into the insert itself. The
+        # embedding itself goes to the memmapped sidecar, not the database.
+        evicted_id = None
+        with self._conn:
+            if self._row_count >= self.config.max_entries:
+                # Evict least-used entry
+                evicted = self._conn.execute(
+                    "DELETE FROM task_chains WHERE id = "
+                    "(SELECT id FROM task_chains ORDER BY hit_count ASC LIMIT 1) "
+                    "RETURNING id"
+                ).fetchone()
+                if evicted:
+                    evicted_id = evicted[0]
+                    self._row_count -= 1
+
+            new_id = self._conn.execute(
+                """INSERT INTO task_chains (task_description, tool_chain, files_modified, cost_usd)
+                   VALUES (?, ?, ?, ?) RETURNING id""",
+                (
+                    task,
+                    json.dumps(tool_chain),
+                    json.dumps(files_modified),
+                    cost_usd,
+                ),
+            ).fetchone()[0]
+
+            # Update the sidecar and record the new row's position while
+            # still inside the transaction, so emb_row updates from an
+            # eviction swap land in the same fsync.
+            if evicted_id is not None:
+                self._remove_embedding(evicted_id)
+            self._append_embedding(new_id, embedding)
             self._conn.execute(
-                "DELETE FROM task_chains WHERE id = (SELECT id FROM task_chains ORDER BY hit_count ASC LIMIT 1)"
+                "UPDATE task_chains SET emb_row = ? WHERE id = ?",
+                (self._id_to_row[new_id], new_id),
             )
-
-        embedding = self._embed(task)
-
-        self._conn.execute(
-            """INSERT INTO task_chains (task_description, tool_chain, files_modified, cost_usd, embedding)
-               VALUES (?, ?, ?, ?, ?)""",
-            (
-                task,
-                json.dumps(tool_chain),
-                json.dumps(files_modified),
-                cost_usd,
-                embedding.tobytes(),
-            ),
-        )
-        self._conn.commit()
-
-        # Update in-memory index
-        self._embeddings.append(embedding)
-        self._chain_ids.append(self._conn.execute("SELECT last_insert_rowid()").fetchone()[0])
+        self._row_count += 1
+
+        if self._ann is not None:
+            if evicted_id is not None:
+                try:
+                    self._ann.mark_deleted(evicted_id)
+                except RuntimeError:
+                    pass
+            self._ann.add_items(
+                (embedding.astype(np.float32) / self._QSCALE)[None, :],
+                [new_id],
+                replace_deleted=True,
+            )
+        elif self.config.ann_enabled and self._size > self._ANN_THRESHOLD:
+            self._build_ann()
 
         logger.debug("Cached tool chain for: %s", task[:80])
 
     @property
     def size(self) -> int:
         """Number of cached entries."""
-        return self._conn.execute("SELECT COUNT(*) FROM task_chains").fetchone()[0]
+        return self._row_count
 
     @property
     def total_hits(self) -> int:
         """Total cache hits across all entries."""
+        if self._conn is None:
+            return 0
         result = self._conn.execute(
             "SELECT COALESCE(SUM(hit_count), 0) FROM task_chains"
         ).fetchone()
         return result[0]
 
     def close(self) -> None:
-        """Close the database connection."""
+        """Flush the embedding file and close the database connection."""
+        if self._conn is None:
+            return
+        self._matrix.flush()
         self._conn.close()
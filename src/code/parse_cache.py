@@ -0,0 +1,160 @@
+"""Persistent content-addressed cache of parse results."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import pickle
+import sqlite3
+from pathlib import Path
+from typing import Iterable
+
+from src.code.parser import ParsedFile, PythonParser
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever ParsedFile/Symbol change shape so stale pickles self-invalidate.
+_SCHEMA_VERSION = 2
+
+
+class ParseCache:
+    """SQLite-backed cache of ParsedFile objects keyed by content hash.
+
+    Re-indexing an unchanged repo skips parsing entirely: each file hashes
+    to the same digest, and the pickled ParsedFile is returned as-is. The
+    cache lives per-project under ``.koda/`` and survives process restarts.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        cache_dir = Path(root) / ".koda"
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(cache_dir / "parse-cache.sqlite"))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS parsed_files (
+                hash TEXT PRIMARY KEY,
+                pickle BLOB NOT NULL,
+                schema_version INT NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def load(self, path: str, content_hash: str) -> ParsedFile | None:
+        """Return the cached parse for a content hash, rebound to path.
+
+        Args:
+            path: Path the file currently lives at (identical content can
+                appear under several paths).
+            content_hash: Hex SHA-256 of the file's bytes.
+
+        Returns:
+            The cached ParsedFile, or None on a miss or stale schema.
+        """
+        row = self._conn.execute(
+            "SELECT pickle FROM parsed_files WHERE hash = ? AND schema_version = ?",
+            (content_hash, _SCHEMA_VERSION),
+        ).fetchone()
+        if row is None:
+            return None
+        try:
+            parsed: ParsedFile = pickle.loads(row[0])
+        except (pickle.UnpicklingError, AttributeError, TypeError):
+            logger.debug("Discarding unreadable parse cache entry %s", content_hash[:12])
+            return None
+        parsed.path = path
+        return parsed
+
+    def store(self, content_hash: str, parsed: ParsedFile) -> None:
+        """Cache a parse result under its content hash."""
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parsed_files (hash, pickle, schema_version) "
+                "VALUES (?, ?, ?)",
+                (content_hash, pickle.dumps(parsed, protocol=5), _SCHEMA_VERSION),
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+
+def parse_cached(parser: PythonParser, cache: ParseCache, path: Path) -> ParsedFile:
+    """Parse a file through the content-addressed cache.
+
+    Reads the file once, probes the cache by SHA-256 of its bytes, and only
+    invokes the parser on a miss, writing the result back for next time.
+
+    Args:
+        parser: Parser used on cache misses.
+        cache: The per-project parse cache.
+        path: Path to a Python file.
+
+    Returns:
+        ParsedFile from cache or a fresh parse.
+    """
+    try:
+        data = path.read_bytes()
+    except OSError:
+        # Let the parser produce its usual error-carrying ParsedFile.
+        return parser.parse_file(path)
+
+    digest = hashlib.sha256(data).hexdigest()
+    parsed = cache.load(str(path), digest)
+    if parsed is None:
+        parsed = parser.parse_file(path)
+        cache.store(digest, parsed)
+    return parsed
+
+
+def parse_cached_many(
+    parser: PythonParser,
+    cache: ParseCache,
+    paths: Iterable[Path],
+    max_workers: int | None = None,
+) -> list[ParsedFile]:
+    """Parse a batch of files through the cache, parsing misses in parallel.
+
+    Cache probes stay serial (SQLite), while the misses go through
+    PythonParser.parse_files so the actual parsing scales across threads.
+
+    Args:
+        parser: Parser used on cache misses.
+        cache: The per-project parse cache.
+        paths: Paths to Python files.
+        max_workers: Thread count for the miss batch; 1 forces serial.
+
+    Returns:
+        One ParsedFile per input path, in order.
+    """
+    paths = list(paths)
+    results: list[ParsedFile | None] = [None] * len(paths)
+    misses: list[int] = []
+    digests: dict[int, str] = {}
+
+    for i, path in enumerate(paths):
+        try:
+            data = path.read_bytes()
+        except OSError:
+            # Let the parser produce its usual error-carrying ParsedFile.
+            misses.append(i)
+            continue
+        digest = hashlib.sha256(data).hexdigest()
+        parsed = cache.load(str(path), digest)
+        if parsed is None:
+            misses.append(i)
+            digests[i] = digest
+        else:
+            results[i] = parsed
+
+    if misses:
+        parsed_iter = parser.parse_files(
+            [paths[i] for i in misses], max_workers=max_workers
+        )
+        for i, parsed in zip(misses, parsed_iter):
+            results[i] = parsed
+            digest = digests.get(i)
+            if digest is not None:
+                cache.store(digest, parsed)
+
+    return results
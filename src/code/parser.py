@@ -2,14 +2,78 @@
 
 from __future__ import annotations
 
+import functools
 import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
 
 logger = logging.getLogger(__name__)
 
 
+def _span(source: bytes, node: Any) -> str:
+    """Decode the source span covered by a tree-sitter node."""
+    return source[node.start_byte : node.end_byte].decode("utf-8", errors="replace")
+
+
+# Mirrors the ToolsConfig.max_file_size default; generated megafiles
+# (vendored copies, pb2 modules) cost more to parse than whole source trees.
+_MAX_FILE_SIZE = 1_048_576
+
+
+def iter_py_files(
+    root: Path, skip_dirs: set[str], max_file_size: int = _MAX_FILE_SIZE
+) -> Iterator[tuple[Path, str]]:
+    """Yield (path, relative_path) for Python files under root.
+
+    A manual os.scandir walk prunes skipped and hidden directories before
+    descending — excluded subtrees are never traversed at all — and builds
+    relative paths by joining names, avoiding a Path.relative_to per file.
+    Oversize files are skipped before anything reads them.
+
+    Args:
+        root: Directory to walk.
+        skip_dirs: Directory names to prune entirely.
+        max_file_size: Skip files larger than this many bytes.
+
+    Yields:
+        (absolute path, root-relative path string) per Python file.
+    """
+    stack: list[tuple[str, str]] = [(str(root), "")]
+    while stack:
+        dir_path, rel_prefix = stack.pop()
+        try:
+            entries = os.scandir(dir_path)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith("."):
+                    continue
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                if is_dir:
+                    if name not in skip_dirs:
+                        stack.append((entry.path, f"{rel_prefix}{name}/"))
+                elif name.endswith(".py"):
+                    try:
+                        size = entry.stat().st_size
+                    except OSError:
+                        continue
+                    if size > max_file_size:
+                        logger.debug(
+                            "Skipping oversize file %s (%d bytes)", entry.path, size
+                        )
+                        continue
+                    yield Path(entry.path), f"{rel_prefix}{name}"
+
+
 @dataclass
 class Symbol:
     """A code symbol extracted from AST parsing."""
@@ -37,7 +101,7 @@ class ParsedFile:
 
     path: str
     symbols: list[Symbol]
-    imports: list[str]
+    imports: list[tuple[str, str]]  # (kind, module) where kind is "from" or "import"
     errors: list[str] = field(default_factory=list)
 
     @property
@@ -65,22 +129,73 @@ class PythonParser:
 
     def __init__(self) -> None:
         self._ts_available = False
-        self._parser = None
         self._language = None
+        self._query = None
+        # tree-sitter Parser objects aren't reentrant; each thread gets its
+        # own, built lazily from the shared Language.
+        self._local = threading.local()
+        # Bounded parse memo keyed by (path, mtime_ns, size); re-scans of
+        # an unchanged repo cost one stat per file, not a parse, and stale
+        # entries age out instead of accumulating. Instance-level so the
+        # cache dies with the parser rather than pinning it globally.
+        self._parse_cached = functools.lru_cache(maxsize=4096)(self._parse_source)
         self._init_tree_sitter()
 
+    # Captures all definition/import nodes in one C-level pass instead of
+    # iterating every node from Python.
+    _QUERY_SOURCE = """
+    (function_definition) @function
+    (class_definition) @class
+    (import_statement) @import
+    (import_from_statement) @import
+    """
+
     def _init_tree_sitter(self) -> None:
         """Initialize tree-sitter parser if available."""
         try:
             import tree_sitter_python as tspython
-            from tree_sitter import Language, Parser
+            from tree_sitter import Language
 
             self._language = Language(tspython.language())
-            self._parser = Parser(self._language)
+            self._query = self._compile_query()
             self._ts_available = True
             logger.debug("Tree-sitter initialized for Python")
         except ImportError:
             logger.info("Tree-sitter not available, falling back to ast module")
+        except Exception as e:
+            # A language/query API mismatch degrades to the ast fallback
+            # rather than taking every consumer down at construction.
+            logger.warning("Tree-sitter init failed (%s); falling back to ast module", e)
+
+    def _compile_query(self):
+        """Compile _QUERY_SOURCE against whichever query API is present.
+
+        Language.query was removed in py-tree-sitter 0.25; newer versions
+        construct a Query directly and execute it through a QueryCursor.
+        """
+        if hasattr(self._language, "query"):
+            return self._language.query(self._QUERY_SOURCE)
+        from tree_sitter import Query
+
+        return Query(self._language, self._QUERY_SOURCE)
+
+    def _query_captures(self, root: Any) -> dict[str, list[Any]]:
+        """Run the compiled query over a tree, handling both query APIs."""
+        if hasattr(self._query, "captures"):
+            return self._query.captures(root)
+        from tree_sitter import QueryCursor
+
+        return QueryCursor(self._query).captures(root)
+
+    def _get_parser(self):
+        """Return this thread's tree-sitter parser, creating it on first use."""
+        parser = getattr(self._local, "parser", None)
+        if parser is None:
+            from tree_sitter import Parser
+
+            parser = Parser(self._language)
+            self._local.parser = parser
+        return parser
 
     def parse_file(self, path: str | Path) -> ParsedFile:
         """Parse a Python file and extract symbols.
@@ -92,28 +207,75 @@ class PythonParser:
             ParsedFile with extracted symbols and imports.
         """
         path = Path(path)
-        if not path.exists():
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
             return ParsedFile(path=str(path), symbols=[], imports=[], errors=["File not found"])
+        except OSError as e:
+            return ParsedFile(path=str(path), symbols=[], imports=[], errors=[str(e)])
 
+        return self._parse_cached(str(path), stat.st_mtime_ns, stat.st_size)
+
+    def _parse_source(self, path: str, _mtime_ns: int, _size: int) -> ParsedFile:
+        """Read and parse a file; mtime and size only participate in the memo key."""
+        # Tree-sitter operates on bytes and reports byte offsets, so keep
+        # the source as bytes and decode only the extracted spans; slicing
+        # a str with byte offsets would misalign on non-ASCII files.
         try:
-            source = path.read_text(encoding="utf-8")
+            source_bytes = Path(path).read_bytes()
         except (PermissionError, OSError) as e:
-            return ParsedFile(path=str(path), symbols=[], imports=[], errors=[str(e)])
+            return ParsedFile(path=path, symbols=[], imports=[], errors=[str(e)])
 
         if self._ts_available:
-            return self._parse_with_tree_sitter(str(path), source)
-        return self._parse_with_ast(str(path), source)
+            return self._parse_with_tree_sitter(path, source_bytes)
+        return self._parse_with_ast(path, source_bytes.decode("utf-8", errors="replace"))
+
+    def parse_files(
+        self, paths: Iterable[str | Path], max_workers: int | None = None
+    ) -> Iterator[ParsedFile]:
+        """Parse several files in parallel, yielding results in input order.
 
-    def _parse_with_tree_sitter(self, path: str, source: str) -> ParsedFile:
+        Tree-sitter's C-level parse releases the GIL, so parsing scales
+        near-linearly with cores across a repo-sized batch of files.
+
+        Args:
+            paths: Paths to Python files.
+            max_workers: Thread count; defaults to the CPU count.
+
+        Yields:
+            ParsedFile per input path, in order.
+        """
+        paths = list(paths)
+        if len(paths) <= 1:
+            for path in paths:
+                yield self.parse_file(path)
+            return
+
+        workers = max_workers or os.cpu_count() or 4
+        with ThreadPoolExecutor(max_workers=min(workers, len(paths))) as executor:
+            yield from executor.map(self.parse_file, paths)
+
+    def _parse_with_tree_sitter(self, path: str, source: bytes) -> ParsedFile:
         """Parse using tree-sitter for more robust handling."""
-        tree = self._parser.parse(source.encode("utf-8"))
+        tree = self._get_parser().parse(source)
         root = tree.root_node
 
         symbols: list[Symbol] = []
-        imports: list[str] = []
+        imports: list[tuple[str, str]] = []
         errors: list[str] = []
 
-        for node in self._walk(root):
+        # One compiled query pass collects every definition/import node;
+        # restrict to direct children of the module to keep the previous
+        # top-level-only semantics, and sort to preserve document order.
+        captured = [
+            (node, capture_name)
+            for capture_name, nodes in self._query_captures(root).items()
+            for node in nodes
+            if node.parent == root
+        ]
+        captured.sort(key=lambda pair: pair[0].start_byte)
+
+        for node, _capture_name in captured:
             if node.type == "function_definition":
                 sym = self._extract_function(node, source)
                 symbols.append(sym)
@@ -134,25 +296,45 @@ class PythonParser:
                             symbols.append(method)
 
             elif node.type in ("import_statement", "import_from_statement"):
-                imports.append(source[node.start_byte : node.end_byte])
+                imports.extend(self._extract_imports(node, source))
 
         if root.has_error:
             errors.append("File contains syntax errors")
 
         return ParsedFile(path=path, symbols=symbols, imports=imports, errors=errors)
 
-    def _extract_function(self, node: Any, source: str) -> Symbol:
+    @staticmethod
+    def _extract_imports(node: Any, source: bytes) -> list[tuple[str, str]]:
+        """Extract (kind, module) tuples from an import node.
+
+        Parsing the module out once here keeps consumers like the repo-map
+        reference graph from re-tokenizing import strings per lookup.
+        """
+        if node.type == "import_from_statement":
+            module_node = node.child_by_field_name("module_name")
+            return [("from", _span(source, module_node) if module_node else "")]
+
+        imports: list[tuple[str, str]] = []
+        for child in node.named_children:
+            if child.type == "dotted_name":
+                imports.append(("import", _span(source, child)))
+            elif child.type == "aliased_import":
+                name_node = child.child_by_field_name("name")
+                imports.append(("import", _span(source, name_node) if name_node else ""))
+        return imports
+
+    def _extract_function(self, node: Any, source: bytes) -> Symbol:
         """Extract a function symbol from a tree-sitter node."""
         name_node = node.child_by_field_name("name")
-        name = source[name_node.start_byte : name_node.end_byte] if name_node else "<unknown>"
+        name = _span(source, name_node) if name_node else "<unknown>"
 
         params_node = node.child_by_field_name("parameters")
-        params = source[params_node.start_byte : params_node.end_byte] if params_node else "()"
+        params = _span(source, params_node) if params_node else "()"
 
         return_node = node.child_by_field_name("return_type")
         return_type = ""
         if return_node:
-            return_type = f" -> {source[return_node.start_byte : return_node.end_byte]}"
+            return_type = f" -> {_span(source, return_node)}"
 
         signature = f"def {name}{params}{return_type}"
         docstring = self._extract_docstring(node, source)
@@ -166,15 +348,15 @@ class PythonParser:
             docstring=docstring,
         )
 
-    def _extract_class(self, node: Any, source: str) -> Symbol:
+    def _extract_class(self, node: Any, source: bytes) -> Symbol:
         """Extract a class symbol from a tree-sitter node."""
         name_node = node.child_by_field_name("name")
-        name = source[name_node.start_byte : name_node.end_byte] if name_node else "<unknown>"
+        name = _span(source, name_node) if name_node else "<unknown>"
 
         superclasses = node.child_by_field_name("superclasses")
         bases = ""
         if superclasses:
-            bases = source[superclasses.start_byte : superclasses.end_byte]
+            bases = _span(source, superclasses)
 
         signature = f"class {name}{bases}"
         docstring = self._extract_docstring(node, source)
@@ -189,7 +371,7 @@ class PythonParser:
         )
 
     @staticmethod
-    def _extract_docstring(node: Any, source: str) -> str:
+    def _extract_docstring(node: Any, source: bytes) -> str:
         """Extract docstring from the first expression statement in a body."""
         body = node.child_by_field_name("body")
         if not body or not body.children:
@@ -199,7 +381,7 @@ class PythonParser:
         if first_stmt.type == "expression_statement":
             expr = first_stmt.children[0] if first_stmt.children else None
             if expr and expr.type == "string":
-                raw = source[expr.start_byte : expr.end_byte]
+                raw = _span(source, expr)
                 # Strip triple quotes
                 for prefix in ('"""', "'''", 'r"""', "r'''"):
                     if raw.startswith(prefix):
@@ -207,18 +389,12 @@ class PythonParser:
                 return raw.strip("\"'").strip()
         return ""
 
-    @staticmethod
-    def _walk(node: Any):
-        """Walk tree-sitter nodes depth-first, yielding only top-level definitions."""
-        for child in node.children:
-            yield child
-
     def _parse_with_ast(self, path: str, source: str) -> ParsedFile:
         """Fallback parser using Python's built-in ast module."""
         import ast as ast_mod
 
         symbols: list[Symbol] = []
-        imports: list[str] = []
+        imports: list[tuple[str, str]] = []
         errors: list[str] = []
 
         try:
@@ -228,7 +404,7 @@ class PythonParser:
 
         for node in ast_mod.iter_child_nodes(tree):
             if isinstance(node, ast_mod.FunctionDef | ast_mod.AsyncFunctionDef):
-                sig = f"def {node.name}({ast_mod.dump(node.args)})"
+                sig = f"def {node.name}({ast_mod.unparse(node.args)})"
                 doc = ast_mod.get_docstring(node) or ""
                 symbols.append(
                     Symbol(
@@ -242,7 +418,7 @@ class PythonParser:
                 )
 
             elif isinstance(node, ast_mod.ClassDef):
-                bases = ", ".join(ast_mod.dump(b) for b in node.bases)
+                bases = ", ".join(ast_mod.unparse(b) for b in node.bases)
                 sig = f"class {node.name}({bases})" if bases else f"class {node.name}"
                 doc = ast_mod.get_docstring(node) or ""
                 class_sym = Symbol(
@@ -262,7 +438,7 @@ class PythonParser:
                             kind="method",
                             line=child.lineno,
                             end_line=child.end_lineno or child.lineno,
-                            signature=f"def {child.name}(...)",
+                            signature=f"def {child.name}({ast_mod.unparse(child.args)})",
                             docstring=method_doc,
                             parent=node.name,
                         )
@@ -273,10 +449,9 @@ class PythonParser:
 
             elif isinstance(node, ast_mod.Import):
                 for alias in node.names:
-                    imports.append(f"import {alias.name}")
+                    imports.append(("import", alias.name))
 
             elif isinstance(node, ast_mod.ImportFrom):
-                names = ", ".join(a.name for a in node.names)
-                imports.append(f"from {node.module} import {names}")
+                imports.append(("from", node.module or ""))
 
         return ParsedFile(path=path, symbols=symbols, imports=imports, errors=errors)
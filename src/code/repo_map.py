@@ -7,16 +7,19 @@ signatures, ranked by importance using a reference graph.
 from __future__ import annotations
 
 import logging
-from collections import defaultdict
+from bisect import bisect_right
+from collections import Counter
 from dataclasses import dataclass, field
+from itertools import accumulate
 from pathlib import Path
 
-from src.code.parser import ParsedFile, PythonParser
+from src.code.parse_cache import ParseCache, parse_cached_many
+from src.code.parser import ParsedFile, PythonParser, iter_py_files
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class FileEntry:
     """A file's contribution to the repo map."""
 
@@ -26,7 +29,7 @@ class FileEntry:
     reference_score: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class RepoMap:
     """A structured overview of repository contents."""
 
@@ -50,22 +53,26 @@ class RepoMap:
         # Sort by reference score (most important files first)
         sorted_entries = sorted(self.entries, key=lambda e: e.reference_score, reverse=True)
 
-        for entry in sorted_entries:
+        for pos, entry in enumerate(sorted_entries):
             header = f"\n{entry.path}"
             if current_chars + len(header) > max_chars:
-                lines.append(f"\n... and {len(sorted_entries) - len(lines) + 2} more files")
+                lines.append(f"\n... and {len(sorted_entries) - pos} more files")
                 break
 
             lines.append(header)
             current_chars += len(header)
 
-            for sig in entry.symbols:
-                line = f"  {sig}"
-                if current_chars + len(line) > max_chars:
-                    lines.append("  ...")
-                    break
-                lines.append(line)
-                current_chars += len(line)
+            # Cumulative symbol costs let one bisect find the cutoff and
+            # one extend emit the kept lines, instead of a length check
+            # and append per symbol.
+            sig_lines = [f"  {sig}" for sig in entry.symbols]
+            cumulative = list(accumulate(len(line) for line in sig_lines))
+            cutoff = bisect_right(cumulative, max_chars - current_chars)
+            lines.extend(sig_lines[:cutoff])
+            if cutoff:
+                current_chars += cumulative[cutoff - 1]
+            if cutoff < len(sig_lines):
+                lines.append("  ...")
 
         lines.append(f"\n({self.total_files} files, {self.total_symbols} symbols)")
         return "\n".join(lines)
@@ -81,33 +88,41 @@ class RepoMapBuilder:
     def __init__(self, parser: PythonParser | None = None) -> None:
         self.parser = parser or PythonParser()
 
-    def build(self, repo_path: str | Path, max_files: int = 100) -> RepoMap:
+    def build(
+        self,
+        repo_path: str | Path,
+        max_files: int = 100,
+        max_workers: int | None = None,
+    ) -> RepoMap:
         """Build a repo map from the given repository path.
 
         Args:
             repo_path: Root directory of the repository.
             max_files: Maximum number of files to include.
+            max_workers: Thread count for parallel parsing; 1 forces serial.
 
         Returns:
             RepoMap with ranked file entries.
         """
         root = Path(repo_path)
         py_files = self._collect_python_files(root, max_files)
+        rel_paths = [rel for _, rel in py_files]
 
-        # Parse all files
-        parsed: list[ParsedFile] = []
-        for f in py_files:
-            result = self.parser.parse_file(f)
-            parsed.append(result)
+        # Parse all files, skipping unchanged content via the on-disk cache
+        # and spreading cache misses across parser threads
+        cache = ParseCache(root)
+        parsed: list[ParsedFile] = parse_cached_many(
+            self.parser, cache, (p for p, _ in py_files), max_workers=max_workers
+        )
+        cache.close()
 
         # Build reference graph
-        reference_counts = self._build_reference_graph(parsed, root)
+        reference_counts = self._build_reference_graph(parsed, rel_paths)
 
         # Create entries
         entries = []
         total_symbols = 0
-        for pf in parsed:
-            rel_path = str(Path(pf.path).relative_to(root))
+        for pf, rel_path in zip(parsed, rel_paths):
             sigs = []
             for sym in pf.symbols:
                 if sym.kind in ("function", "class"):
@@ -135,50 +150,44 @@ class RepoMapBuilder:
         return repo_map
 
     @staticmethod
-    def _collect_python_files(root: Path, max_files: int) -> list[Path]:
-        """Collect Python files, excluding hidden dirs and common non-source dirs."""
+    def _collect_python_files(root: Path, max_files: int) -> list[tuple[Path, str]]:
+        """Collect (path, relative path) pairs, excluding hidden and non-source dirs."""
         skip_dirs = {"__pycache__", ".git", "node_modules", ".venv", "venv", ".tox", "dist"}
-        files = []
-        for path in root.rglob("*.py"):
-            parts = path.relative_to(root).parts
-            if any(part in skip_dirs or part.startswith(".") for part in parts):
-                continue
-            files.append(path)
+        files: list[tuple[Path, str]] = []
+        for pair in iter_py_files(root, skip_dirs):
+            files.append(pair)
             if len(files) >= max_files:
                 break
-        return sorted(files)
+        files.sort(key=lambda pair: pair[1])
+        return files
 
     @staticmethod
-    def _build_reference_graph(parsed: list[ParsedFile], root: Path) -> dict[str, float]:
+    def _build_reference_graph(
+        parsed: list[ParsedFile], rel_paths: list[str]
+    ) -> dict[str, float]:
         """Count how often each module is imported by other files."""
-        counts: dict[str, float] = defaultdict(float)
-
-        # Map module names to file paths
-        module_to_path: dict[str, str] = {}
-        for pf in parsed:
-            rel = str(Path(pf.path).relative_to(root))
+        counts: Counter[str] = Counter()
+
+        # Index modules by full dotted path and by last component, so each
+        # import resolves with O(1) dict probes instead of scanning every
+        # known module.
+        by_full: dict[str, str] = {}
+        by_tail: dict[str, list[str]] = {}
+        for rel in rel_paths:
             module = rel.replace("/", ".").removesuffix(".py")
-            module_to_path[module] = rel
-            # Also map the last component
-            parts = module.split(".")
-            if parts:
-                module_to_path[parts[-1]] = rel
+            by_full[module] = rel
+            by_tail.setdefault(module.rsplit(".", 1)[-1], []).append(rel)
 
         for pf in parsed:
-            for imp in pf.imports:
-                # Extract module name from import statement
-                parts = imp.split()
-                if "from" in parts:
-                    idx = parts.index("from") + 1
-                    if idx < len(parts):
-                        module = parts[idx]
-                else:
-                    idx = parts.index("import") + 1 if "import" in parts else -1
-                    module = parts[idx] if idx >= 0 and idx < len(parts) else ""
-
-                # Check all possible module path matches
-                for mod_name, file_path in module_to_path.items():
-                    if module.endswith(mod_name) or mod_name.endswith(module):
-                        counts[file_path] += 1.0
+            for _kind, module in pf.imports:
+                if not module:
+                    continue
+
+                hit = by_full.get(module)
+                if hit is not None:
+                    counts[hit] += 1
+                    continue
+                for rel in by_tail.get(module.rsplit(".", 1)[-1], ()):
+                    counts[rel] += 1
 
         return dict(counts)
@@ -2,22 +2,32 @@
 
 from __future__ import annotations
 
+import heapq
 import logging
+from collections import defaultdict
 from dataclasses import dataclass
 from pathlib import Path
 
-from src.code.parser import ParsedFile, PythonParser, Symbol
+from src.code.parse_cache import ParseCache, parse_cached_many
+from src.code.parser import ParsedFile, PythonParser, Symbol, iter_py_files
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SymbolMatch:
     """A symbol search result with context."""
 
     symbol: Symbol
     file_path: str
     relevance: float = 1.0
+    # Lowercased names cached at index time so the search loop does no
+    # .lower() allocations per symbol per query.
+    name_lower: str = ""
+    qualified_lower: str = ""
+    # Both lowercased names joined with NUL, so the substring branch is a
+    # single scan instead of two.
+    haystack: str = ""
 
     @property
     def display(self) -> str:
@@ -38,12 +48,18 @@ class SymbolIndex:
         self.parser = parser or PythonParser()
         self._files: dict[str, ParsedFile] = {}
         self._symbols: list[SymbolMatch] = []
+        # Symbols partitioned by kind, so kind-filtered searches scan only
+        # the matching bucket instead of branching on every symbol.
+        self._by_kind: dict[str, list[SymbolMatch]] = defaultdict(list)
+        # Exact-name lookup, keyed by lowercased name and qualified name.
+        self._exact: dict[str, list[SymbolMatch]] = defaultdict(list)
 
-    def index_directory(self, path: str | Path) -> int:
+    def index_directory(self, path: str | Path, max_workers: int | None = None) -> int:
         """Index all Python files in a directory.
 
         Args:
             path: Root directory to index.
+            max_workers: Thread count for parallel parsing; 1 forces serial.
 
         Returns:
             Number of symbols indexed.
@@ -51,18 +67,31 @@ class SymbolIndex:
         root = Path(path)
         skip_dirs = {"__pycache__", ".git", "node_modules", ".venv", "venv"}
 
-        count = 0
-        for py_file in root.rglob("*.py"):
-            parts = py_file.relative_to(root).parts
-            if any(part in skip_dirs or part.startswith(".") for part in parts):
-                continue
+        pairs = list(iter_py_files(root, skip_dirs))
+        cache = ParseCache(root)
+        parsed_files = parse_cached_many(
+            self.parser, cache, (p for p, _ in pairs), max_workers=max_workers
+        )
+        cache.close()
 
-            parsed = self.parser.parse_file(py_file)
-            rel_path = str(py_file.relative_to(root))
+        count = 0
+        for (_py_file, rel_path), parsed in zip(pairs, parsed_files):
             self._files[rel_path] = parsed
-
             for sym in parsed.symbols:
-                self._symbols.append(SymbolMatch(symbol=sym, file_path=rel_path))
+                name_lower = sym.name.lower()
+                qualified_lower = sym.qualified_name.lower()
+                sm = SymbolMatch(
+                    symbol=sym,
+                    file_path=rel_path,
+                    name_lower=name_lower,
+                    qualified_lower=qualified_lower,
+                    haystack=f"{name_lower}\0{qualified_lower}",
+                )
+                self._symbols.append(sm)
+                self._by_kind[sym.kind].append(sm)
+                self._exact[sm.name_lower].append(sm)
+                if sm.qualified_lower != sm.name_lower:
+                    self._exact[sm.qualified_lower].append(sm)
                 count += 1
 
         logger.info("Indexed %d symbols from %d files", count, len(self._files))
@@ -85,33 +114,47 @@ class SymbolIndex:
             List of matching SymbolMatch results, ranked by relevance.
         """
         query_lower = query.lower()
-        matches = []
 
-        for sm in self._symbols:
-            if kind and sm.symbol.kind != kind:
-                continue
-
-            name_lower = sm.symbol.name.lower()
-            qualified_lower = sm.symbol.qualified_name.lower()
-
-            # Exact match
-            if name_lower == query_lower or qualified_lower == query_lower:
-                matches.append(
-                    SymbolMatch(symbol=sm.symbol, file_path=sm.file_path, relevance=1.0)
-                )
-            # Prefix match
-            elif name_lower.startswith(query_lower):
-                matches.append(
-                    SymbolMatch(symbol=sm.symbol, file_path=sm.file_path, relevance=0.8)
-                )
-            # Substring match
-            elif query_lower in name_lower or query_lower in qualified_lower:
-                matches.append(
-                    SymbolMatch(symbol=sm.symbol, file_path=sm.file_path, relevance=0.5)
+        # Fast path: a direct hit in the exact-name index answers short
+        # lookups without scanning the whole symbol table.
+        exact = self._exact.get(query_lower)
+        if exact:
+            if kind:
+                exact = [sm for sm in exact if sm.symbol.kind == kind]
+            if len(exact) >= max_results:
+                return heapq.nsmallest(
+                    max_results,
+                    (
+                        SymbolMatch(symbol=sm.symbol, file_path=sm.file_path, relevance=1.0)
+                        for sm in exact
+                    ),
+                    key=lambda m: m.symbol.name,
                 )
 
-        matches.sort(key=lambda m: (-m.relevance, m.symbol.name))
-        return matches[:max_results]
+        scan = self._by_kind.get(kind, ()) if kind else self._symbols
+        # Score into cheap (−relevance, name, index, match) tuples;
+        # SymbolMatch wrappers are only materialized for the survivors
+        # below. The index keeps ties orderable without comparing matches.
+        scored: list[tuple[float, str, int, SymbolMatch]] = []
+
+        for index, sm in enumerate(scan):
+            # Exact and prefix hits are also substring hits, so one
+            # haystack scan rejects the (vast majority of) misses and the
+            # hits get a straight-line arithmetic score instead of a
+            # branch cascade: 1.0 exact, 0.8 prefix, 0.5 substring.
+            if query_lower not in sm.haystack:
+                continue
+            exact = (query_lower == sm.name_lower) | (query_lower == sm.qualified_lower)
+            prefix = sm.name_lower.startswith(query_lower)
+            relevance = 0.5 + 0.5 * exact + 0.3 * (prefix & ~exact)
+            scored.append((-relevance, sm.symbol.name, index, sm))
+
+        # Top-K selection beats a full sort: O(N log K) over tens of
+        # thousands of symbols for a typical max_results of 20.
+        return [
+            SymbolMatch(symbol=sm.symbol, file_path=sm.file_path, relevance=-neg_rel)
+            for neg_rel, _name, _index, sm in heapq.nsmallest(max_results, scored)
+        ]
 
     def get_file_symbols(self, path: str) -> list[Symbol]:
         """Get all symbols from a specific file."""
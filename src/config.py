@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+import functools
+import hashlib
+import json
 import logging
 import os
+import pickle
 from pathlib import Path
 from typing import Any
 
@@ -14,6 +18,9 @@ logger = logging.getLogger(__name__)
 
 DEFAULT_CONFIG_PATH = Path(__file__).parent.parent / "configs" / "default.yaml"
 
+# Prefer the libyaml C loader when the cold path does parse YAML.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class LLMConfig(BaseModel):
     """LLM provider configuration."""
@@ -72,6 +79,7 @@ class CriticConfig(BaseModel):
     run_lint: bool = True
     ast_check: bool = True
     rubric_enabled: bool = True
+    max_eval_input_tokens: int = 800
 
 
 class CacheConfig(BaseModel):
@@ -81,6 +89,7 @@ class CacheConfig(BaseModel):
     similarity_threshold: float = 0.85
     enabled: bool = True
     max_entries: int = 1000
+    ann_enabled: bool = True
 
 
 class ModelPricing(BaseModel):
@@ -128,9 +137,46 @@ class Settings(BaseModel):
     anthropic_api_key: str = ""
 
 
+@functools.lru_cache(maxsize=1)
+def _schema_key() -> str:
+    """Digest of the full Settings JSON schema.
+
+    Top-level field names alone miss additions to the nested models, so a
+    cache written by an older checkout would validate and only fail at
+    first attribute access; the schema digest covers every level.
+    """
+    schema = json.dumps(Settings.model_json_schema(), sort_keys=True)
+    return hashlib.blake2b(schema.encode(), digest_size=16).hexdigest()
+
+
+def _load_cached_settings(cache_path: Path, mtime_ns: int) -> Settings | None:
+    """Return the cached validated Settings if still fresh, else None."""
+    try:
+        with open(cache_path, "rb") as f:
+            cached_mtime, schema_key, settings = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, AttributeError, EOFError, ValueError):
+        return None
+    if cached_mtime != mtime_ns or schema_key != _schema_key():
+        return None
+    return settings if isinstance(settings, Settings) else None
+
+
+def _store_cached_settings(cache_path: Path, mtime_ns: int, settings: Settings) -> None:
+    """Write the validated Settings next to the config file; best effort."""
+    try:
+        with open(cache_path, "wb") as f:
+            pickle.dump((mtime_ns, _schema_key(), settings), f, protocol=5)
+    except OSError:
+        logger.debug("Could not write settings cache at %s", cache_path)
+
+
 def load_config(path: str | Path | None = None) -> Settings:
     """Load configuration from YAML file with environment variable overrides.
 
+    A pickle of the validated Settings is cached next to the YAML, keyed by
+    the file's mtime and the Settings schema digest, so unchanged configs
+    skip both YAML parsing and pydantic validation on startup.
+
     Args:
         path: Path to YAML config file. Uses default if not provided.
 
@@ -139,20 +185,34 @@ def load_config(path: str | Path | None = None) -> Settings:
     """
     config_path = Path(path) if path else DEFAULT_CONFIG_PATH
 
-    raw: dict[str, Any] = {}
+    settings: Settings | None = None
+    cache_path: Path | None = None
+    mtime_ns = 0
     if config_path.exists():
-        with open(config_path) as f:
-            raw = yaml.safe_load(f) or {}
-        logger.info("Loaded config from %s", config_path)
-    else:
-        logger.warning("Config file not found at %s, using defaults", config_path)
-
-    # Environment variable overrides
+        cache_path = config_path.with_name(config_path.name + ".cache")
+        mtime_ns = config_path.stat().st_mtime_ns
+        settings = _load_cached_settings(cache_path, mtime_ns)
+
+    if settings is None:
+        raw: dict[str, Any] = {}
+        if cache_path is not None:
+            with open(config_path) as f:
+                raw = yaml.load(f, Loader=_YAML_LOADER) or {}
+            logger.info("Loaded config from %s", config_path)
+        else:
+            logger.warning("Config file not found at %s, using defaults", config_path)
+
+        settings = Settings(**raw)
+        if cache_path is not None:
+            _store_cached_settings(cache_path, mtime_ns, settings)
+
+    # Environment variable overrides, applied after caching so the pickle
+    # never bakes in a process-specific key.
     api_key = os.environ.get("ANTHROPIC_API_KEY", "")
     if api_key:
-        raw["anthropic_api_key"] = api_key
+        settings.anthropic_api_key = api_key
 
-    return Settings(**raw)
+    return settings
 
 
 def setup_logging(config: LoggingConfig) -> None:
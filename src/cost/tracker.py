@@ -19,7 +19,7 @@ class BudgetExceededError(Exception):
         super().__init__(f"Budget exceeded: ${spent:.4f} spent of ${budget:.4f} limit")
 
 
-@dataclass
+@dataclass(slots=True)
 class APICallRecord:
     """Record of a single API call's token usage and cost."""
 
@@ -39,7 +39,7 @@ class APICallRecord:
         return self.input_tokens + self.output_tokens
 
 
-@dataclass
+@dataclass(slots=True)
 class CostTracker:
     """Tracks API costs per task with budget enforcement.
 
@@ -50,6 +50,11 @@ class CostTracker:
     config: CostConfig
     records: list[APICallRecord] = field(default_factory=list)
     _cache_savings: float = 0.0
+    # Running totals so budget checks and summaries stay O(1) instead of
+    # re-scanning the record list on every call.
+    _total_cost: float = 0.0
+    _total_input_tokens: int = 0
+    _total_output_tokens: int = 0
 
     def record_call(
         self,
@@ -94,8 +99,11 @@ class CostTracker:
             cached_tokens=cached_tokens,
         )
         self.records.append(record)
+        self._total_cost += input_cost + output_cost
+        self._total_input_tokens += input_tokens
+        self._total_output_tokens += output_tokens
 
-        total = self.total_cost
+        total = self._total_cost
         budget = self.config.budget_per_task_usd
 
         if total > budget * 0.8:
@@ -114,22 +122,22 @@ class CostTracker:
     @property
     def total_cost(self) -> float:
         """Total cost across all recorded API calls."""
-        return sum(r.total_cost for r in self.records)
+        return self._total_cost
 
     @property
     def total_tokens(self) -> int:
         """Total tokens across all recorded API calls."""
-        return sum(r.total_tokens for r in self.records)
+        return self._total_input_tokens + self._total_output_tokens
 
     @property
     def total_input_tokens(self) -> int:
         """Total input tokens across all calls."""
-        return sum(r.input_tokens for r in self.records)
+        return self._total_input_tokens
 
     @property
     def total_output_tokens(self) -> int:
         """Total output tokens across all calls."""
-        return sum(r.output_tokens for r in self.records)
+        return self._total_output_tokens
 
     @property
     def cache_savings(self) -> float:
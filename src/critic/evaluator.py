@@ -2,10 +2,18 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 from dataclasses import dataclass, field
 
+try:
+    # orjson parses the rubric JSON severalfold faster than the stdlib;
+    # its JSONDecodeError subclasses ValueError, so the except below holds.
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
+
 from src.config import CriticConfig
 from src.llm.client import LLMClient
 from src.llm.models import Conversation
@@ -29,18 +37,29 @@ Evaluate on these dimensions:
 4. **Simplicity** — Is the code minimal and focused, or over-engineered?
 
 Respond with ONLY valid JSON:
-{{
-    "correctness": {{"score": 1-5, "reasoning": "..."}},
-    "style": {{"score": 1-5, "reasoning": "..."}},
-    "edge_cases": {{"score": 1-5, "reasoning": "..."}},
-    "simplicity": {{"score": 1-5, "reasoning": "..."}},
+{
+    "correctness": {"score": 1-5, "reasoning": "..."},
+    "style": {"score": 1-5, "reasoning": "..."},
+    "edge_cases": {"score": 1-5, "reasoning": "..."},
+    "simplicity": {"score": 1-5, "reasoning": "..."},
     "overall_verdict": "pass" or "fail",
     "suggestions": ["suggestion 1", "suggestion 2"]
-}}
+}
 """
 
+# Split the template at its substitution points once at import; building a
+# prompt is then a plain join, with no per-call format-string parsing (the
+# literal JSON braces above would otherwise need escaping for str.format).
+_PROMPT_HEAD, _rest = EVALUATOR_PROMPT.split("{code}")
+_PROMPT_MID, _PROMPT_TAIL = _rest.split("{task}")
+
+
+def _format_prompt(code: str, task: str) -> str:
+    """Render the evaluator prompt for one code/task pair."""
+    return "".join((_PROMPT_HEAD, code, _PROMPT_MID, task, _PROMPT_TAIL))
 
-@dataclass
+
+@dataclass(slots=True)
 class DimensionScore:
     """Score for a single evaluation dimension."""
 
@@ -49,7 +68,7 @@ class DimensionScore:
     reasoning: str
 
 
-@dataclass
+@dataclass(slots=True)
 class EvaluationResult:
     """Full evaluation result from the LLM critic."""
 
@@ -90,6 +109,9 @@ class Evaluator:
     pass/fail verdict with per-dimension scores.
     """
 
+    # Bound on the evaluation memo; cleared wholesale when full.
+    _EVAL_CACHE_MAX = 512
+
     def __init__(
         self,
         config: CriticConfig,
@@ -97,6 +119,9 @@ class Evaluator:
     ) -> None:
         self.config = config
         self.llm = llm_client
+        # Critic retry loops and cached chains re-evaluate identical
+        # code/task pairs; memoize by content digest to skip the LLM call.
+        self._cache: dict[bytes, EvaluationResult] = {}
 
     def evaluate(self, code: str, task: str) -> EvaluationResult:
         """Evaluate code changes against the task requirements.
@@ -111,7 +136,22 @@ class Evaluator:
         if not self.config.rubric_enabled:
             return EvaluationResult(verdict="pass", suggestions=[])
 
-        prompt = EVALUATOR_PROMPT.format(code=code[:3000], task=task)
+        # Truncate by the configured token budget (~4 chars per token, the
+        # same heuristic the rest of the codebase uses) — every character
+        # here is billed on each critic cycle.
+        code = code[: self.config.max_eval_input_tokens * 4]
+
+        # Only the truncated code ever reaches the prompt, so the key
+        # hashes the same slice the LLM would see.
+        key = (
+            hashlib.sha256(code.encode()).digest()
+            + hashlib.sha256(task.encode()).digest()
+        )
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        prompt = _format_prompt(code, task)
         conversation = Conversation(
             system_prompt="You are a precise code reviewer. Respond only with JSON."
         )
@@ -123,21 +163,30 @@ class Evaluator:
             max_tokens_override=512,
         )
 
-        return self._parse_evaluation(response.text)
+        result = self._parse_evaluation(response.text)
+
+        if len(self._cache) >= self._EVAL_CACHE_MAX:
+            self._cache.clear()
+        self._cache[key] = result
+        return result
 
     def _parse_evaluation(self, text: str) -> EvaluationResult:
         """Parse the LLM's JSON evaluation response."""
         result = EvaluationResult(raw_response=text)
 
         try:
-            # Extract JSON from response (handle markdown code blocks)
             json_text = text.strip()
-            if "```" in json_text:
-                start = json_text.index("{")
-                end = json_text.rindex("}") + 1
-                json_text = json_text[start:end]
-
-            data = json.loads(json_text)
+            # Models usually obey the JSON-only instruction, so a bare
+            # object skips extraction entirely; anything else (markdown
+            # fences, prose) gets the braces sliced out. find/rfind avoid
+            # raising on responses with no JSON at all.
+            if not (json_text.startswith("{") and json_text.endswith("}")):
+                start = json_text.find("{")
+                end = json_text.rfind("}")
+                if start != -1 and end > start:
+                    json_text = json_text[start : end + 1]
+
+            data = _loads(json_text)
 
             for dimension in ["correctness", "style", "edge_cases", "simplicity"]:
                 if dimension in data:
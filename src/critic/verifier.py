@@ -2,10 +2,15 @@
 
 from __future__ import annotations
 
+import ast
+import hashlib
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
+from typing import Callable
 
 from src.config import CriticConfig
 from src.tools.code import ASTCheckTool, LintTool, TestRunnerTool
@@ -14,6 +19,10 @@ from src.trace.models import EventType
 
 logger = logging.getLogger(__name__)
 
+# Hoisted so the summary loop does a constant dict probe instead of
+# building the literal per check.
+_STATUS_ICONS = {"passed": "OK", "failed": "FAIL", "skipped": "SKIP"}
+
 
 class CheckStatus(str, Enum):
     """Status of a verification check."""
@@ -23,7 +32,7 @@ class CheckStatus(str, Enum):
     SKIPPED = "skipped"
 
 
-@dataclass
+@dataclass(slots=True)
 class CheckResult:
     """Result of a single verification check."""
 
@@ -33,7 +42,7 @@ class CheckResult:
     details: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class VerificationResult:
     """Aggregated result of the full verification pipeline."""
 
@@ -49,7 +58,7 @@ class VerificationResult:
         """Human-readable summary of verification results."""
         lines = []
         for check in self.checks:
-            icon = {"passed": "OK", "failed": "FAIL", "skipped": "SKIP"}[check.status.value]
+            icon = _STATUS_ICONS[check.status.value]
             lines.append(f"  [{icon}] {check.check_name}: {check.message}")
         return "\n".join(lines)
 
@@ -80,6 +89,41 @@ class Verifier:
         self._ast_tool = ASTCheckTool()
         self._lint_tool = LintTool()
         self._test_tool = TestRunnerTool()
+        # Critic loops re-verify files that did not change between
+        # iterations; memoize AST/lint results by content digest so
+        # unchanged files cost a stat instead of a tool invocation.
+        self._result_cache: dict[str, CheckResult] = {}
+        self._digest_cache: dict[str, tuple[int, str]] = {}
+        self._test_imports: dict[str, tuple[int, frozenset[str]]] = {}
+
+    @staticmethod
+    def _map_checks(check_fn: Callable[[str], CheckResult], py_files: list[str]) -> list[CheckResult]:
+        """Run a per-file check across files, in parallel when it pays off.
+
+        Each check shells out to its tool, so threads overlap the subprocess
+        waits; results come back in input order so fail-fast scans and the
+        rendered summary stay deterministic.
+        """
+        if len(py_files) <= 1:
+            return [check_fn(f) for f in py_files]
+        workers = min(max(1, (os.cpu_count() or 2) - 2), len(py_files))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(check_fn, py_files))
+
+    def _content_digest(self, file_path: str) -> str | None:
+        """Digest a file's content, skipping the read when mtime is unchanged."""
+        try:
+            mtime_ns = Path(file_path).stat().st_mtime_ns
+            cached = self._digest_cache.get(file_path)
+            if cached is not None and cached[0] == mtime_ns:
+                return cached[1]
+            digest = hashlib.blake2b(
+                Path(file_path).read_bytes(), digest_size=16
+            ).hexdigest()
+        except OSError:
+            return None
+        self._digest_cache[file_path] = (mtime_ns, digest)
+        return digest
 
     def verify(self, files: list[str], test_path: str = "tests/") -> VerificationResult:
         """Run the full verification pipeline on modified files.
@@ -92,12 +136,11 @@ class Verifier:
             VerificationResult with all check outcomes.
         """
         result = VerificationResult()
+        py_files = [f for f in files if f.endswith(".py")]
 
         # 1. AST check on Python files
         if self.config.ast_check:
-            py_files = [f for f in files if f.endswith(".py")]
-            for file_path in py_files:
-                check = self._run_ast_check(file_path)
+            for check in self._map_checks(self._run_ast_check, py_files):
                 result.checks.append(check)
                 if check.status == CheckStatus.FAILED:
                     self._record_check(check)
@@ -109,17 +152,15 @@ class Verifier:
 
         # 2. Lint check
         if self.config.run_lint:
-            for file_path in [f for f in files if f.endswith(".py")]:
-                check = self._run_lint_check(file_path)
-                result.checks.append(check)
+            result.checks.extend(self._map_checks(self._run_lint_check, py_files))
         else:
             result.checks.append(
                 CheckResult(check_name="lint", status=CheckStatus.SKIPPED, message="Disabled")
             )
 
-        # 3. Test execution
+        # 3. Test execution, narrowed to tests affected by the changed files
         if self.config.run_tests:
-            check = self._run_tests(test_path)
+            check = self._run_tests(self._affected_tests(files, test_path) or test_path)
             result.checks.append(check)
         else:
             result.checks.append(
@@ -131,42 +172,132 @@ class Verifier:
 
     def _run_ast_check(self, file_path: str) -> CheckResult:
         """Run AST syntax check on a single file."""
+        digest = self._content_digest(file_path)
+        key = f"ast:{Path(file_path).name}:{digest}"
+        if digest is not None:
+            cached = self._result_cache.get(key)
+            if cached is not None:
+                return cached
+
         tool_result = self._ast_tool.safe_execute(path=file_path)
 
         if tool_result.success:
-            return CheckResult(
+            check = CheckResult(
                 check_name=f"ast_check:{Path(file_path).name}",
                 status=CheckStatus.PASSED,
                 message="Syntax OK",
             )
-        return CheckResult(
-            check_name=f"ast_check:{Path(file_path).name}",
-            status=CheckStatus.FAILED,
-            message="Syntax error",
-            details=tool_result.error or tool_result.output,
-        )
+        else:
+            check = CheckResult(
+                check_name=f"ast_check:{Path(file_path).name}",
+                status=CheckStatus.FAILED,
+                message="Syntax error",
+                details=tool_result.error or tool_result.output,
+            )
+        if digest is not None:
+            self._result_cache[key] = check
+        return check
 
     def _run_lint_check(self, file_path: str) -> CheckResult:
         """Run ruff lint check on a single file."""
+        digest = self._content_digest(file_path)
+        key = f"lint:{Path(file_path).name}:{digest}"
+        if digest is not None:
+            cached = self._result_cache.get(key)
+            if cached is not None:
+                return cached
+
         tool_result = self._lint_tool.safe_execute(path=file_path)
 
         if tool_result.success:
-            return CheckResult(
+            check = CheckResult(
                 check_name=f"lint:{Path(file_path).name}",
                 status=CheckStatus.PASSED,
                 message="No lint issues",
             )
-        return CheckResult(
-            check_name=f"lint:{Path(file_path).name}",
-            status=CheckStatus.FAILED,
-            message="Lint issues found",
-            details=tool_result.output,
+        else:
+            check = CheckResult(
+                check_name=f"lint:{Path(file_path).name}",
+                status=CheckStatus.FAILED,
+                message="Lint issues found",
+                details=tool_result.output,
+            )
+        if digest is not None:
+            self._result_cache[key] = check
+        return check
+
+    def _affected_tests(self, files: list[str], test_path: str) -> list[str]:
+        """Select the test files exercised by the changed files.
+
+        A test counts as affected when it follows the test_<module>.py naming
+        convention for a changed module, or when it imports that module.
+        Returns a path list for the test runner, or [] to fall back to the
+        full suite — when the selection cannot be trusted (conftest/config
+        changes) or nothing matches.
+        """
+        test_root = Path(test_path)
+        if not test_root.is_dir():
+            return []
+
+        selected: set[str] = set()
+        changed: list[tuple[str, str]] = []  # (stem, dotted module path)
+        for file_path in files:
+            name = Path(file_path).name
+            if name in ("conftest.py", "pyproject.toml", "setup.py", "setup.cfg"):
+                return []  # Fixture/config changes can affect any test
+            if not name.endswith(".py"):
+                continue
+            if name.startswith("test_"):
+                selected.add(file_path)
+                continue
+            stem = Path(file_path).stem
+            dotted = file_path.removesuffix(".py").replace("/", ".").replace("\\", ".")
+            changed.append((stem, dotted))
+
+        if changed:
+            for test_file in sorted(test_root.rglob("test_*.py")):
+                imports = self._test_file_imports(test_file)
+                tails = {imp.rsplit(".", 1)[-1] for imp in imports}
+                for stem, dotted in changed:
+                    if (
+                        test_file.name == f"test_{stem}.py"
+                        or dotted in imports
+                        or stem in tails
+                    ):
+                        selected.add(str(test_file))
+                        break
+
+        return sorted(selected)
+
+    def _test_file_imports(self, test_file: Path) -> frozenset[str]:
+        """Parse a test file's imports, cached by mtime."""
+        try:
+            mtime_ns = test_file.stat().st_mtime_ns
+            cached = self._test_imports.get(str(test_file))
+            if cached is not None and cached[0] == mtime_ns:
+                return cached[1]
+            tree = ast.parse(test_file.read_bytes())
+        except (OSError, SyntaxError):
+            return frozenset()
+
+        modules: set[str] = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                modules.update(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module:
+                modules.add(node.module)
+                modules.update(f"{node.module}.{alias.name}" for alias in node.names)
+
+        imports = frozenset(modules)
+        self._test_imports[str(test_file)] = (mtime_ns, imports)
+        return imports
+
+    def _run_tests(self, test_path: str | list[str]) -> CheckResult:
+        """Run pytest on the test directory, sharded across cores when possible."""
+        tool_result = self._test_tool.safe_execute(
+            path=test_path, workers=max(1, (os.cpu_count() or 2) - 2)
         )
 
-    def _run_tests(self, test_path: str) -> CheckResult:
-        """Run pytest on the test directory."""
-        tool_result = self._test_tool.safe_execute(path=test_path)
-
         if tool_result.success:
             return CheckResult(
                 check_name="tests",
@@ -183,25 +314,27 @@ class Verifier:
 
     def _record_check(self, check: CheckResult) -> None:
         """Record a check result in the trace."""
-        if self.trace:
-            self.trace.record(
-                EventType.CRITIC_CHECK,
-                {
-                    "check": check.check_name,
-                    "status": check.status.value,
-                    "message": check.message,
-                },
-            )
+        if self.trace is None:
+            return
+        self.trace.record(
+            EventType.CRITIC_CHECK,
+            {
+                "check": check.check_name,
+                "status": check.status.value,
+                "message": check.message,
+            },
+        )
 
     def _record_check_summary(self, result: VerificationResult) -> None:
         """Record the full verification summary in the trace."""
-        if self.trace:
-            self.trace.record(
-                EventType.CRITIC_CHECK,
-                {
-                    "summary": result.summary,
-                    "passed": result.passed,
-                    "total_checks": len(result.checks),
-                    "failed_checks": len(result.errors),
-                },
-            )
+        if self.trace is None:
+            return  # Skip materializing the summary string entirely
+        self.trace.record(
+            EventType.CRITIC_CHECK,
+            {
+                "summary": result.summary,
+                "passed": result.passed,
+                "total_checks": len(result.checks),
+                "failed_checks": len(result.errors),
+            },
+        )
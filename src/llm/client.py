@@ -71,7 +71,20 @@ class LLMClient:
             "messages": conversation.to_api_format(),
         }
 
-        if conversation.system_prompt:
+        if conversation.cached_system_prefix:
+            # Stable prefix goes first as an ephemeral-cached block so the
+            # provider can reuse it across calls; the dynamic part follows.
+            system_blocks: list[dict[str, Any]] = [
+                {
+                    "type": "text",
+                    "text": conversation.cached_system_prefix,
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ]
+            if conversation.system_prompt:
+                system_blocks.append({"type": "text", "text": conversation.system_prompt})
+            kwargs["system"] = system_blocks
+        elif conversation.system_prompt:
             kwargs["system"] = conversation.system_prompt
 
         if tools:
@@ -93,19 +106,15 @@ class LLMClient:
         # Make API call
         response = self.client.messages.create(**kwargs)
 
-        # Parse response content blocks
-        content_blocks: list[TextContent | ToolUseContent] = []
-        for block in response.content:
-            if block.type == "text":
-                content_blocks.append(TextContent(text=block.text))
-            elif block.type == "tool_use":
-                content_blocks.append(
-                    ToolUseContent(
-                        id=block.id,
-                        name=block.name,
-                        input=block.input,
-                    )
-                )
+        # Parse response content blocks in one comprehension — sized up
+        # front, one type-tag branch per block, unknown block types dropped
+        content_blocks: list[TextContent | ToolUseContent] = [
+            TextContent(text=block.text)
+            if block.type == "text"
+            else ToolUseContent(id=block.id, name=block.name, input=block.input)
+            for block in response.content
+            if block.type in ("text", "tool_use")
+        ]
 
         # Extract usage
         usage = response.usage
@@ -22,7 +22,7 @@ class ContentType(str, Enum):
     TOOL_RESULT = "tool_result"
 
 
-@dataclass
+@dataclass(slots=True)
 class TextContent:
     """A text content block."""
 
@@ -30,7 +30,7 @@ class TextContent:
     type: str = "text"
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolUseContent:
     """A tool_use content block from the assistant."""
 
@@ -40,7 +40,7 @@ class ToolUseContent:
     type: str = "tool_use"
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolResultContent:
     """A tool_result content block sent back to the API."""
 
@@ -50,55 +50,57 @@ class ToolResultContent:
     type: str = "tool_result"
 
 
-@dataclass
+# Serialization handlers keyed by each block's type tag; a dict probe beats
+# chained isinstance checks when long conversations are rebuilt per call.
+_FORMATTERS = {
+    "text": lambda b: {"type": "text", "text": b.text},
+    "tool_use": lambda b: {
+        "type": "tool_use",
+        "id": b.id,
+        "name": b.name,
+        "input": b.input,
+    },
+    "tool_result": lambda b: {
+        "type": "tool_result",
+        "tool_use_id": b.tool_use_id,
+        "content": b.content,
+        "is_error": b.is_error,
+    },
+}
+
+
+@dataclass(slots=True)
 class Message:
     """A conversation message with structured content blocks."""
 
     role: Role
     content: list[TextContent | ToolUseContent | ToolResultContent]
+    # Messages are append-only and never edited after creation, so the
+    # serialized form is computed once; rebuilding a long conversation's
+    # payload then only pays for messages added since the last call.
+    _cached_api: dict[str, Any] | None = field(default=None, init=False, repr=False)
 
     def to_api_format(self) -> dict[str, Any]:
         """Convert to Anthropic API message format."""
-        formatted_content = []
-        for block in self.content:
-            if isinstance(block, TextContent):
-                formatted_content.append({"type": "text", "text": block.text})
-            elif isinstance(block, ToolUseContent):
-                formatted_content.append(
-                    {
-                        "type": "tool_use",
-                        "id": block.id,
-                        "name": block.name,
-                        "input": block.input,
-                    }
-                )
-            elif isinstance(block, ToolResultContent):
-                formatted_content.append(
-                    {
-                        "type": "tool_result",
-                        "tool_use_id": block.tool_use_id,
-                        "content": block.content,
-                        "is_error": block.is_error,
-                    }
-                )
-        return {"role": self.role.value, "content": formatted_content}
+        if self._cached_api is None:
+            self._cached_api = {
+                "role": self.role.value,
+                "content": [_FORMATTERS[block.type](block) for block in self.content],
+            }
+        return self._cached_api
 
     @property
     def text(self) -> str:
         """Extract concatenated text from all text content blocks."""
-        parts = []
-        for block in self.content:
-            if isinstance(block, TextContent):
-                parts.append(block.text)
-        return "\n".join(parts)
+        return "\n".join(block.text for block in self.content if block.type == "text")
 
     @property
     def tool_calls(self) -> list[ToolUseContent]:
         """Extract all tool_use blocks from this message."""
-        return [b for b in self.content if isinstance(b, ToolUseContent)]
+        return [b for b in self.content if b.type == "tool_use"]
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolDefinition:
     """A tool definition for the Anthropic API."""
 
@@ -115,7 +117,7 @@ class ToolDefinition:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMResponse:
     """Parsed response from the LLM API."""
 
@@ -134,61 +136,83 @@ class LLMResponse:
     @property
     def tool_calls(self) -> list[ToolUseContent]:
         """Extract tool_use blocks from the response."""
-        return [b for b in self.content if isinstance(b, ToolUseContent)]
+        return [b for b in self.content if b.type == "tool_use"]
 
     @property
     def text(self) -> str:
         """Extract concatenated text from response."""
-        parts = []
-        for block in self.content:
-            if isinstance(block, TextContent):
-                parts.append(block.text)
-        return "\n".join(parts)
+        return "\n".join(block.text for block in self.content if block.type == "text")
 
     @property
     def total_tokens(self) -> int:
         return self.input_tokens + self.output_tokens
 
 
-@dataclass
+@dataclass(slots=True)
 class Conversation:
     """Manages the message history for an agent session."""
 
     system_prompt: str = ""
+    # Optional stable prefix sent as a separate system block tagged with
+    # provider-native prompt caching (Anthropic cache_control). Must be
+    # byte-identical across calls to hit the cache.
+    cached_system_prefix: str = ""
     messages: list[Message] = field(default_factory=list)
+    # Running character count of message content, maintained by the add_*
+    # methods so token_estimate is O(1) instead of rescanning every block.
+    _char_total: int = field(default=0, init=False, repr=False)
+    # Single-entry memo of the last serialized history, keyed on message
+    # count; successive calls only serialize messages appended in between.
+    _last_api: tuple[int, list[dict[str, Any]]] | None = field(
+        default=None, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        self._char_total = sum(
+            self._block_chars(block) for msg in self.messages for block in msg.content
+        )
+
+    @staticmethod
+    def _block_chars(block: TextContent | ToolUseContent | ToolResultContent) -> int:
+        """Character cost of one content block for the token estimate."""
+        if block.type == "text":
+            return len(block.text)
+        if block.type == "tool_result":
+            return len(block.content)
+        return len(str(block.input))
+
+    def _append(self, msg: Message) -> Message:
+        self.messages.append(msg)
+        self._char_total += sum(self._block_chars(block) for block in msg.content)
+        return msg
 
     def add_user_message(self, text: str) -> Message:
         """Add a user text message."""
-        msg = Message(role=Role.USER, content=[TextContent(text=text)])
-        self.messages.append(msg)
-        return msg
+        return self._append(Message(role=Role.USER, content=[TextContent(text=text)]))
 
     def add_assistant_message(self, content: list[TextContent | ToolUseContent]) -> Message:
         """Add an assistant message from LLM response content."""
-        msg = Message(role=Role.ASSISTANT, content=content)
-        self.messages.append(msg)
-        return msg
+        return self._append(Message(role=Role.ASSISTANT, content=content))
 
     def add_tool_results(self, results: list[ToolResultContent]) -> Message:
         """Add tool results as a user message."""
-        msg = Message(role=Role.USER, content=results)
-        self.messages.append(msg)
-        return msg
+        return self._append(Message(role=Role.USER, content=results))
 
     def to_api_format(self) -> list[dict[str, Any]]:
         """Convert full message history to API format."""
-        return [m.to_api_format() for m in self.messages]
+        done = 0
+        prefix: list[dict[str, Any]] = []
+        if self._last_api is not None and self._last_api[0] <= len(self.messages):
+            done, prefix = self._last_api
+        formatted = prefix + [m.to_api_format() for m in self.messages[done:]]
+        self._last_api = (len(self.messages), formatted)
+        return formatted
 
     @property
     def token_estimate(self) -> int:
-        """Rough token count estimate (4 chars per token heuristic)."""
-        total_chars = len(self.system_prompt)
-        for msg in self.messages:
-            for block in msg.content:
-                if isinstance(block, TextContent):
-                    total_chars += len(block.text)
-                elif isinstance(block, ToolResultContent):
-                    total_chars += len(block.content)
-                elif isinstance(block, ToolUseContent):
-                    total_chars += len(str(block.input))
-        return total_chars // 4
+        """Rough token count estimate (4 chars per token heuristic).
+
+        The system prompt is measured fresh (it may be reassigned); message
+        content uses the running total kept by the add_* methods.
+        """
+        return (len(self.system_prompt) + self._char_total) // 4
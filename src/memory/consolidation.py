@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import logging
 
-from src.memory.episodic import Episode, EpisodicMemory
+from src.memory.episodic import EpisodeDigest, EpisodicMemory
 from src.memory.semantic import SemanticEntry, SemanticMemory
 
 logger = logging.getLogger(__name__)
@@ -43,28 +43,31 @@ class MemoryConsolidator:
         Returns:
             List of newly created semantic entries.
         """
-        episodes = self.episodic.get_successful(limit=self.consolidation_threshold * 2)
+        episodes = self.episodic.get_successful_for_consolidation(
+            limit=self.consolidation_threshold * 2
+        )
         if not episodes:
             return []
 
         new_entries: list[SemanticEntry] = []
 
-        # Extract tool chain patterns
-        tool_patterns = self._extract_tool_patterns(episodes)
-        for pattern_desc, task_ids in tool_patterns:
+        # Extract tool chain patterns from the counts table maintained at
+        # store time, so this scales with distinct chains rather than episodes
+        for chain, count, task_ids in self.episodic.top_tool_chains():
             entry = SemanticEntry(
-                content=pattern_desc,
+                content=f"Common tool chain pattern ({count} occurrences): {chain}",
                 category="pattern",
                 source_task_ids=task_ids,
             )
             self.semantic.store(entry)
             new_entries.append(entry)
 
-        # Extract file modification patterns
-        file_patterns = self._extract_file_patterns(episodes)
-        for pattern_desc, task_ids in file_patterns:
+        # Extract file modification patterns — aggregated in SQL over the
+        # normalized episode_files table rather than a Python Counter
+        file_patterns = self.episodic.frequent_files([ep.task_id for ep in episodes])
+        for file_path, count, task_ids in file_patterns:
             entry = SemanticEntry(
-                content=pattern_desc,
+                content=f"Frequently modified file ({count} times): {file_path}",
                 category="pattern",
                 source_task_ids=task_ids,
             )
@@ -93,51 +96,7 @@ class MemoryConsolidator:
         return new_entries
 
     @staticmethod
-    def _extract_tool_patterns(episodes: list[Episode]) -> list[tuple[str, list[str]]]:
-        """Find common tool chain sequences across episodes."""
-        from collections import Counter
-
-        chain_counter: Counter[str] = Counter()
-        chain_to_tasks: dict[str, list[str]] = {}
-
-        for ep in episodes:
-            # Normalize tool chain to a signature
-            chain_key = " -> ".join(ep.tool_chain[:5])  # First 5 tools
-            if chain_key:
-                chain_counter[chain_key] += 1
-                chain_to_tasks.setdefault(chain_key, []).append(ep.task_id)
-
-        patterns = []
-        for chain, count in chain_counter.most_common(3):
-            if count >= 2:
-                desc = f"Common tool chain pattern ({count} occurrences): {chain}"
-                patterns.append((desc, chain_to_tasks[chain]))
-
-        return patterns
-
-    @staticmethod
-    def _extract_file_patterns(episodes: list[Episode]) -> list[tuple[str, list[str]]]:
-        """Find commonly modified file groups."""
-        from collections import Counter
-
-        file_counter: Counter[str] = Counter()
-        file_to_tasks: dict[str, list[str]] = {}
-
-        for ep in episodes:
-            for f in ep.files_modified:
-                file_counter[f] += 1
-                file_to_tasks.setdefault(f, []).append(ep.task_id)
-
-        patterns = []
-        for file_path, count in file_counter.most_common(5):
-            if count >= 2:
-                desc = f"Frequently modified file ({count} times): {file_path}"
-                patterns.append((desc, file_to_tasks[file_path]))
-
-        return patterns
-
-    @staticmethod
-    def _extract_lessons(episodes: list[Episode]) -> list[tuple[str, list[str]]]:
+    def _extract_lessons(episodes: list[EpisodeDigest]) -> list[tuple[str, list[str]]]:
         """Extract key lessons from episode summaries."""
         lessons = []
         for ep in episodes:
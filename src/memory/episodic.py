@@ -4,58 +4,157 @@ from __future__ import annotations
 
 import json
 import logging
+import re
 import sqlite3
-from dataclasses import dataclass
+import sys
+import threading
 from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple
+
+try:
+    # orjson encodes/decodes the small list columns severalfold faster
+    # than the stdlib; it emits bytes, so decode for the TEXT columns.
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+except ImportError:
+    _loads = json.loads
+    _dumps = json.dumps
 
 logger = logging.getLogger(__name__)
 
+# Shared by store and store_many; keeping the text identical lets sqlite3's
+# per-connection statement cache reuse the prepared statement.
+_INSERT_EPISODE_SQL = """INSERT OR REPLACE INTO episodes
+    (task_id, task_description, outcome, summary, tool_chain,
+     files_modified, duration_seconds, cost_usd, timestamp, metadata,
+     search_blob)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, lower(?2 || ' ' || ?4))"""
 
-@dataclass
-class Episode:
-    """A single episode representing a completed task."""
+
+class EpisodeDigest(NamedTuple):
+    """Lightweight projection of an episode used by memory consolidation."""
 
     task_id: str
     task_description: str
-    outcome: str  # "success" or "failure"
     summary: str
     tool_chain: list[str]
     files_modified: list[str]
-    duration_seconds: float
-    cost_usd: float
-    timestamp: float
-    metadata: dict[str, Any] | None = None
+
+
+class Episode:
+    """A single episode representing a completed task.
+
+    The list/dict fields are held as raw JSON when loaded from SQLite and
+    decoded lazily on first access — display paths (recent/search listings)
+    usually only read the scalar columns.
+    """
+
+    __slots__ = (
+        "task_id",
+        "task_description",
+        "outcome",
+        "summary",
+        "duration_seconds",
+        "cost_usd",
+        "timestamp",
+        "_tool_chain",
+        "_files_modified",
+        "_metadata",
+    )
+
+    def __init__(
+        self,
+        task_id: str,
+        task_description: str,
+        outcome: str,  # "success" or "failure"
+        summary: str,
+        tool_chain: list[str] | str,
+        files_modified: list[str] | str,
+        duration_seconds: float,
+        cost_usd: float,
+        timestamp: float,
+        metadata: dict[str, Any] | str | None = None,
+    ) -> None:
+        self.task_id = task_id
+        self.task_description = task_description
+        self.outcome = outcome
+        self.summary = summary
+        self.duration_seconds = duration_seconds
+        self.cost_usd = cost_usd
+        self.timestamp = timestamp
+        self._tool_chain = tool_chain
+        self._files_modified = files_modified
+        self._metadata = metadata
+
+    @property
+    def tool_chain(self) -> list[str]:
+        if isinstance(self._tool_chain, str):
+            # Tool names repeat across every stored episode; interning makes
+            # the consolidator's Counter compare them by identity.
+            self._tool_chain = [sys.intern(s) for s in _loads(self._tool_chain)]
+        return self._tool_chain
+
+    @property
+    def files_modified(self) -> list[str]:
+        if isinstance(self._files_modified, str):
+            self._files_modified = [sys.intern(s) for s in _loads(self._files_modified)]
+        return self._files_modified
+
+    @property
+    def metadata(self) -> dict[str, Any] | None:
+        if isinstance(self._metadata, str):
+            self._metadata = _loads(self._metadata) if self._metadata else None
+        return self._metadata
 
     def to_row(self) -> tuple:
-        """Convert to SQLite row format."""
+        """Convert to SQLite row format, reusing raw JSON when never decoded."""
+        tool_chain = (
+            self._tool_chain
+            if isinstance(self._tool_chain, str)
+            else _dumps(self._tool_chain)
+        )
+        files_modified = (
+            self._files_modified
+            if isinstance(self._files_modified, str)
+            else _dumps(self._files_modified)
+        )
+        metadata = (
+            self._metadata
+            if isinstance(self._metadata, str)
+            else _dumps(self._metadata or {})
+        )
         return (
             self.task_id,
             self.task_description,
             self.outcome,
             self.summary,
-            json.dumps(self.tool_chain),
-            json.dumps(self.files_modified),
+            tool_chain,
+            files_modified,
             self.duration_seconds,
             self.cost_usd,
             self.timestamp,
-            json.dumps(self.metadata or {}),
+            metadata,
         )
 
     @classmethod
     def from_row(cls, row: tuple) -> Episode:
-        """Create from SQLite row."""
+        """Create from SQLite row without decoding the JSON columns."""
         return cls(
             task_id=row[0],
             task_description=row[1],
             outcome=row[2],
             summary=row[3],
-            tool_chain=json.loads(row[4]),
-            files_modified=json.loads(row[5]),
+            tool_chain=row[4],
+            files_modified=row[5],
             duration_seconds=row[6],
             cost_usd=row[7],
             timestamp=row[8],
-            metadata=json.loads(row[9]) if row[9] else None,
+            metadata=row[9],
         )
 
 
@@ -69,9 +168,45 @@ class EpisodicMemory:
     def __init__(self, db_path: str = "data/episodic.db") -> None:
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._conn = sqlite3.connect(str(self.db_path))
+        # One connection per thread (WAL lets their reads overlap writes);
+        # tracked so close() can tear them all down.
+        self._local = threading.local()
+        self._conns: list[sqlite3.Connection] = []
+        self._conns_lock = threading.Lock()
         self._create_table()
 
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """The calling thread's connection, opened lazily."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open_connection()
+            self._local.conn = conn
+            with self._conns_lock:
+                self._conns.append(conn)
+        return conn
+
+    def _open_connection(self) -> sqlite3.Connection:
+        # check_same_thread is relaxed only so close() can finalize
+        # connections owned by other threads; queries stay thread-local.
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        # WAL avoids the per-commit journal rewrite and lets readers overlap
+        # writers; NORMAL drops the fsync-per-insert that dominates store().
+        # page_size only takes effect on fresh databases, so it precedes the
+        # first table create; the 64 MiB page cache keeps indexes hot for
+        # the consolidator.
+        conn.execute("PRAGMA page_size=8192")
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA cache_size=-65536")
+        # Without this, the implicit delete inside INSERT OR REPLACE skips
+        # the delete triggers, leaving the FTS mirror and the stats row
+        # stale whenever an episode is re-stored.
+        conn.execute("PRAGMA recursive_triggers=ON")
+        return conn
+
     def _create_table(self) -> None:
         """Create the episodes table if it doesn't exist."""
         self._conn.execute("""
@@ -85,31 +220,235 @@ class EpisodicMemory:
                 duration_seconds REAL,
                 cost_usd REAL,
                 timestamp REAL NOT NULL,
-                metadata TEXT
+                metadata TEXT,
+                search_blob TEXT
             )
         """)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(episodes)")}
+        if "search_blob" not in columns:
+            # Case-folded haystack for the non-FTS search fallback; folding
+            # once at insert beats LIKE's per-row case handling.
+            self._conn.execute("ALTER TABLE episodes ADD COLUMN search_blob TEXT")
+            self._conn.execute(
+                "UPDATE episodes SET search_blob = lower(task_description || ' ' || summary)"
+            )
         self._conn.execute("""
             CREATE INDEX IF NOT EXISTS idx_episodes_timestamp
             ON episodes(timestamp DESC)
         """)
+        self._conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_episodes_outcome_ts
+            ON episodes(outcome, timestamp DESC)
+        """)
+        files_existed = (
+            self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='episode_files'"
+            ).fetchone()
+            is not None
+        )
+        # Normalized copy of files_modified so file-frequency questions are
+        # a single indexed GROUP BY instead of a Python pass over every
+        # episode's json.
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS episode_files (
+                task_id TEXT NOT NULL,
+                file_path TEXT NOT NULL,
+                PRIMARY KEY (task_id, file_path)
+            )
+        """)
+        if not files_existed:
+            self._backfill_episode_files()
+        chains_existed = (
+            self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='tool_chain_counts'"
+            ).fetchone()
+            is not None
+        )
+        # Running counts of successful tool-chain signatures, maintained at
+        # store time so consolidation reads a tiny ordered table instead of
+        # recounting recent episodes.
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS tool_chain_counts (
+                chain TEXT PRIMARY KEY,
+                count INTEGER NOT NULL,
+                task_ids TEXT NOT NULL
+            )
+        """)
+        if not chains_existed:
+            self._backfill_tool_chain_counts()
+        # Trigger-maintained row count; should_consolidate polls it on every
+        # task, so keep it O(1) instead of a table scan. INSERT OR REPLACE
+        # fires both triggers on replace, which nets out correctly.
+        self._conn.execute("CREATE TABLE IF NOT EXISTS episode_stats (count INTEGER NOT NULL)")
+        self._conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS episodes_count_ai AFTER INSERT ON episodes BEGIN
+                UPDATE episode_stats SET count = count + 1;
+            END
+        """)
+        self._conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS episodes_count_ad AFTER DELETE ON episodes BEGIN
+                UPDATE episode_stats SET count = count - 1;
+            END
+        """)
+        if self._conn.execute("SELECT 1 FROM episode_stats").fetchone() is None:
+            self._conn.execute(
+                "INSERT INTO episode_stats SELECT COUNT(*) FROM episodes"
+            )
+        try:
+            fts_existed = (
+                self._conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type='table' AND name='episodes_fts'"
+                ).fetchone()
+                is not None
+            )
+            self._conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS episodes_fts USING fts5(
+                    task_description,
+                    summary,
+                    content='episodes',
+                    content_rowid='rowid'
+                )
+            """)
+            self._conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS episodes_ai AFTER INSERT ON episodes BEGIN
+                    INSERT INTO episodes_fts(rowid, task_description, summary)
+                    VALUES (new.rowid, new.task_description, new.summary);
+                END
+            """)
+            self._conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS episodes_ad AFTER DELETE ON episodes BEGIN
+                    INSERT INTO episodes_fts(episodes_fts, rowid, task_description, summary)
+                    VALUES ('delete', old.rowid, old.task_description, old.summary);
+                END
+            """)
+            self._conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS episodes_au AFTER UPDATE ON episodes BEGIN
+                    INSERT INTO episodes_fts(episodes_fts, rowid, task_description, summary)
+                    VALUES ('delete', old.rowid, old.task_description, old.summary);
+                    INSERT INTO episodes_fts(rowid, task_description, summary)
+                    VALUES (new.rowid, new.task_description, new.summary);
+                END
+            """)
+            if not fts_existed:
+                # Index any rows that predate the FTS mirror; the delete
+                # triggers misfire against an empty external-content index.
+                self._conn.execute("INSERT INTO episodes_fts(episodes_fts) VALUES ('rebuild')")
+            self._fts_enabled = True
+        except sqlite3.OperationalError:
+            logger.info("SQLite FTS5 unavailable; episode search falls back to LIKE scan")
+            self._fts_enabled = False
         self._conn.commit()
 
+    def _backfill_episode_files(self) -> None:
+        """Populate episode_files from rows that predate the table."""
+        try:
+            self._conn.execute("""
+                INSERT OR IGNORE INTO episode_files (task_id, file_path)
+                SELECT e.task_id, j.value FROM episodes e, json_each(e.files_modified) j
+            """)
+        except sqlite3.OperationalError:
+            # json1 unavailable; fall back to decoding in Python
+            rows = self._conn.execute("SELECT task_id, files_modified FROM episodes").fetchall()
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO episode_files (task_id, file_path) VALUES (?, ?)",
+                [(task_id, f) for task_id, files in rows for f in _loads(files)],
+            )
+
+    def _backfill_tool_chain_counts(self) -> None:
+        """Populate tool_chain_counts from rows that predate the table."""
+        rows = self._conn.execute(
+            "SELECT task_id, tool_chain FROM episodes WHERE outcome = 'success'"
+        ).fetchall()
+        for task_id, raw_chain in rows:
+            self._count_tool_chain(task_id, _loads(raw_chain))
+
+    def _count_tool_chain(self, task_id: str, tool_chain: list[str]) -> None:
+        """Upsert a successful episode's chain signature into the counts table."""
+        chain_key = " -> ".join(tool_chain[:5])
+        if not chain_key:
+            return
+        self._conn.execute(
+            """INSERT INTO tool_chain_counts (chain, count, task_ids) VALUES (?, 1, ?)
+               ON CONFLICT(chain) DO UPDATE SET
+                   count = count + 1,
+                   task_ids = task_ids || ',' || excluded.task_ids""",
+            (chain_key, task_id),
+        )
+
+    def _uncount_tool_chain(self, task_id: str) -> None:
+        """Remove the chain contribution of an episode about to be replaced.
+
+        INSERT OR REPLACE implicitly deletes any previous row for the task;
+        without this, re-storing a successful episode would double-count its
+        signature and duplicate the task_id in the counts table.
+        """
+        row = self._conn.execute(
+            "SELECT tool_chain FROM episodes WHERE task_id = ? AND outcome = 'success'",
+            (task_id,),
+        ).fetchone()
+        if row is None:
+            return
+        chain_key = " -> ".join(_loads(row[0])[:5])
+        entry = self._conn.execute(
+            "SELECT count, task_ids FROM tool_chain_counts WHERE chain = ?", (chain_key,)
+        ).fetchone()
+        if entry is None:
+            return
+        task_ids = entry[1].split(",")
+        if task_id not in task_ids:
+            return
+        task_ids.remove(task_id)
+        if task_ids:
+            self._conn.execute(
+                "UPDATE tool_chain_counts SET count = ?, task_ids = ? WHERE chain = ?",
+                (entry[0] - 1, ",".join(task_ids), chain_key),
+            )
+        else:
+            self._conn.execute("DELETE FROM tool_chain_counts WHERE chain = ?", (chain_key,))
+
+    def _sync_episode_files(self, episode: Episode) -> None:
+        """Mirror an episode's files_modified into the normalized table."""
+        self._conn.execute("DELETE FROM episode_files WHERE task_id = ?", (episode.task_id,))
+        if episode.files_modified:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO episode_files (task_id, file_path) VALUES (?, ?)",
+                [(episode.task_id, f) for f in episode.files_modified],
+            )
+
     def store(self, episode: Episode) -> None:
         """Store a task episode.
 
         Args:
             episode: The completed episode to store.
         """
-        self._conn.execute(
-            """INSERT OR REPLACE INTO episodes
-               (task_id, task_description, outcome, summary, tool_chain,
-                files_modified, duration_seconds, cost_usd, timestamp, metadata)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            episode.to_row(),
-        )
+        self._uncount_tool_chain(episode.task_id)
+        self._conn.execute(_INSERT_EPISODE_SQL, episode.to_row())
+        self._sync_episode_files(episode)
+        if episode.outcome == "success":
+            self._count_tool_chain(episode.task_id, episode.tool_chain)
         self._conn.commit()
         logger.debug("Stored episode: %s (%s)", episode.task_id, episode.outcome)
 
+    def store_many(self, episodes: list[Episode]) -> None:
+        """Store a batch of episodes in a single transaction.
+
+        Args:
+            episodes: Completed episodes to store.
+        """
+        if not episodes:
+            return
+        with self._conn:
+            for episode in episodes:
+                self._uncount_tool_chain(episode.task_id)
+            self._conn.executemany(
+                _INSERT_EPISODE_SQL, [episode.to_row() for episode in episodes]
+            )
+            for episode in episodes:
+                self._sync_episode_files(episode)
+                if episode.outcome == "success":
+                    self._count_tool_chain(episode.task_id, episode.tool_chain)
+        logger.debug("Stored %d episodes", len(episodes))
+
     def get_recent(self, limit: int = 10) -> list[Episode]:
         """Retrieve most recent episodes.
 
@@ -135,11 +474,26 @@ class EpisodicMemory:
         Returns:
             Matching episodes.
         """
+        if self._fts_enabled:
+            tokens = re.findall(r"\w+", query)
+            if tokens:
+                match_expr = " OR ".join(f'"{t}"' for t in tokens[:32])
+                try:
+                    cursor = self._conn.execute(
+                        """SELECT e.* FROM episodes e
+                           JOIN episodes_fts f ON e.rowid = f.rowid
+                           WHERE episodes_fts MATCH ? ORDER BY rank LIMIT ?""",
+                        (match_expr, limit),
+                    )
+                    return [Episode.from_row(row) for row in cursor.fetchall()]
+                except sqlite3.OperationalError:
+                    pass  # Malformed MATCH syntax; fall back to LIKE
+
         cursor = self._conn.execute(
             """SELECT * FROM episodes
-               WHERE task_description LIKE ? OR summary LIKE ?
+               WHERE instr(search_blob, ?) > 0
                ORDER BY timestamp DESC LIMIT ?""",
-            (f"%{query}%", f"%{query}%", limit),
+            (query.lower(), limit),
         )
         return [Episode.from_row(row) for row in cursor.fetchall()]
 
@@ -151,12 +505,73 @@ class EpisodicMemory:
         )
         return [Episode.from_row(row) for row in cursor.fetchall()]
 
+    def get_successful_for_consolidation(self, limit: int = 20) -> list[EpisodeDigest]:
+        """Retrieve recent successful episodes projected to consolidation columns.
+
+        Skips the unused columns (durations, costs, metadata) and their
+        json parsing; the outcome index turns the filter into a range scan.
+        """
+        cursor = self._conn.execute(
+            """SELECT task_id, task_description, summary, tool_chain, files_modified
+               FROM episodes WHERE outcome = 'success'
+               ORDER BY timestamp DESC LIMIT ?""",
+            (limit,),
+        )
+        return [
+            EpisodeDigest(
+                task_id=row[0],
+                task_description=row[1],
+                summary=row[2],
+                tool_chain=[sys.intern(s) for s in _loads(row[3])],
+                files_modified=[sys.intern(s) for s in _loads(row[4])],
+            )
+            for row in cursor.fetchall()
+        ]
+
+    def frequent_files(
+        self, task_ids: list[str], min_count: int = 2, limit: int = 5
+    ) -> list[tuple[str, int, list[str]]]:
+        """Aggregate commonly modified files across the given episodes in SQL.
+
+        Returns:
+            (file_path, count, task_ids) tuples, most frequent first.
+        """
+        if not task_ids:
+            return []
+        placeholders = ",".join("?" * len(task_ids))
+        cursor = self._conn.execute(
+            f"""SELECT file_path, COUNT(*) AS c, group_concat(task_id)
+                FROM episode_files WHERE task_id IN ({placeholders})
+                GROUP BY file_path HAVING c >= ? ORDER BY c DESC LIMIT ?""",
+            (*task_ids, min_count, limit),
+        )
+        return [(row[0], row[1], row[2].split(",")) for row in cursor.fetchall()]
+
+    def top_tool_chains(
+        self, limit: int = 3, min_count: int = 2
+    ) -> list[tuple[str, int, list[str]]]:
+        """Most common successful tool-chain signatures.
+
+        Returns:
+            (chain, count, task_ids) tuples, most frequent first.
+        """
+        cursor = self._conn.execute(
+            "SELECT chain, count, task_ids FROM tool_chain_counts "
+            "WHERE count >= ? ORDER BY count DESC LIMIT ?",
+            (min_count, limit),
+        )
+        return [(row[0], row[1], row[2].split(",")) for row in cursor.fetchall()]
+
     @property
     def count(self) -> int:
         """Total number of stored episodes."""
-        cursor = self._conn.execute("SELECT COUNT(*) FROM episodes")
+        cursor = self._conn.execute("SELECT count FROM episode_stats")
         return cursor.fetchone()[0]
 
     def close(self) -> None:
-        """Close the database connection."""
-        self._conn.close()
+        """Close every thread's database connection."""
+        with self._conns_lock:
+            conns, self._conns = self._conns, []
+        for conn in conns:
+            conn.close()
+        self._local = threading.local()
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import json
 import logging
 from dataclasses import dataclass, field
@@ -10,6 +11,14 @@ from typing import Any
 
 import numpy as np
 
+try:
+    # orjson reads and writes the entries file severalfold faster than the
+    # stdlib, which matters once semantic memory accumulates thousands of
+    # distilled entries loaded on every startup.
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,18 +39,50 @@ class SemanticMemory:
     Supports similarity-based retrieval using sentence-transformer embeddings.
     """
 
+    # Entry count at which an exhaustive flat index stops being the right
+    # trade-off and the store swaps to a trained IVFPQ index.
+    _IVF_THRESHOLD = 10_000
+    # Pending entries are embedded and added once this many accumulate
+    # (search and save flush earlier as needed).
+    _FLUSH_THRESHOLD = 64
+    # Delta entries past this count are folded into the sealed base index;
+    # the delta is rewritten in full on every save, so it is kept small.
+    _DELTA_MERGE_THRESHOLD = 1024
+
     def __init__(
         self,
         index_path: str = "data/semantic.faiss",
         embedding_model: str = "all-MiniLM-L6-v2",
+        index_type: str = "auto",
+        nlist: int = 1024,
+        nprobe: int = 16,
     ) -> None:
         self.index_path = Path(index_path)
         self.entries_path = self.index_path.with_suffix(".json")
+        self.delta_path = self.index_path.with_suffix(".delta.faiss")
         self._embedding_model_name = embedding_model
         self._model = None
+        # The store is sharded: a sealed base index holds everything merged
+        # so far and only hits disk after a merge, while a small flat delta
+        # absorbs recent additions and is the only shard routine saves
+        # rewrite. Index rows across base-then-delta align with _entries.
         self._index = None
+        self._delta = None
+        self._base_dirty = False
         self._entries: list[SemanticEntry] = []
         self._dimension = 384  # Default for all-MiniLM-L6-v2
+        # "flat" and "ivfpq" force an index kind; "auto" starts flat and
+        # upgrades once the entry count crosses _IVF_THRESHOLD.
+        self.index_type = index_type
+        self.nlist = nlist
+        self.nprobe = nprobe
+        # Write buffer: entries wait here so one transformer forward pass
+        # and one FAISS add cover the whole batch.
+        self._pending: list[SemanticEntry] = []
+        # Agent loops repeat queries; a bounded memo turns the repeat
+        # transformer pass into a dict hit. Cached as bytes — ndarrays
+        # aren't safely hashable.
+        self._embed_query_cached = functools.lru_cache(maxsize=1024)(self._embed_query_bytes)
 
         self._load_state()
 
@@ -57,42 +98,146 @@ class SemanticMemory:
                 logger.warning("sentence-transformers not available, using random embeddings")
         return self._model
 
+    def _new_index(self, faiss, kind: str):
+        """Build an empty FAISS index of the requested kind."""
+        if kind == "ivfpq":
+            index = faiss.index_factory(
+                self._dimension, f"IVF{self.nlist},PQ32x8", faiss.METRIC_INNER_PRODUCT
+            )
+            index.nprobe = self.nprobe
+            return index
+        # fp16 scalar quantization halves the flat index's memory and bandwidth
+        # for negligible recall loss on normalized embeddings; FAISS converts
+        # the float32 inputs on add, so _embed stays unchanged.
+        return faiss.IndexScalarQuantizer(
+            self._dimension, faiss.ScalarQuantizer.QT_fp16, faiss.METRIC_INNER_PRODUCT
+        )
+
     def _get_index(self):
-        """Lazy-load or create the FAISS index."""
+        """Lazy-load or create the base FAISS index."""
         if self._index is None:
             try:
                 import faiss
 
-                self._index = faiss.IndexFlatIP(self._dimension)
+                kind = "ivfpq" if self.index_type == "ivfpq" else "flat"
+                self._index = self._new_index(faiss, kind)
             except ImportError:
                 logger.warning("faiss not available, semantic search disabled")
         return self._index
 
+    def _get_delta(self):
+        """Lazy-create the flat delta index that absorbs recent additions."""
+        if self._delta is None:
+            try:
+                import faiss
+
+                self._delta = self._new_index(faiss, "flat")
+            except ImportError:
+                pass
+        return self._delta
+
+    def _maybe_upgrade_index(self) -> None:
+        """Swap the exhaustive flat index for a trained IVFPQ once it pays off.
+
+        Exhaustive inner product is O(N·d) per query; past the threshold the
+        compressed IVFPQ index is trained on the vectors reconstructed from
+        the flat index and takes over.
+        """
+        if self.index_type != "auto" or self._index is None:
+            return
+        try:
+            import faiss
+        except ImportError:
+            return
+        if (
+            isinstance(self._index, faiss.IndexIVF)
+            or self._index.ntotal < self._IVF_THRESHOLD
+        ):
+            return
+
+        vectors = self._index.reconstruct_n(0, self._index.ntotal)
+        upgraded = self._new_index(faiss, "ivfpq")
+        upgraded.train(vectors)
+        upgraded.add(vectors)
+        self._index = upgraded
+        self._base_dirty = True
+        logger.info("Upgraded semantic index to IVFPQ at %d entries", len(vectors))
+
+    def _maybe_merge_delta(self) -> None:
+        """Fold the delta into the sealed base once it outgrows cheap rewrites.
+
+        Vectors move in insertion order so index rows stay aligned with
+        _entries; the base is flagged for a one-time rewrite on the next
+        save and may upgrade to IVFPQ while it is in hand.
+        """
+        if self._delta is None or self._delta.ntotal <= self._DELTA_MERGE_THRESHOLD:
+            return
+        base = self._get_index()
+        if base is None:
+            return
+        import faiss
+
+        vectors = self._delta.reconstruct_n(0, self._delta.ntotal)
+        if isinstance(base, faiss.IndexIVF) and not base.is_trained:
+            base.train(vectors)
+        base.add(vectors)
+        self._delta.reset()
+        self._base_dirty = True
+        self._maybe_upgrade_index()
+
     def _embed(self, texts: list[str]) -> np.ndarray:
         """Generate embeddings for text inputs."""
         model = self._get_model()
         if model:
-            embeddings = model.encode(texts, normalize_embeddings=True)
+            embeddings = model.encode(
+                texts, batch_size=64, normalize_embeddings=True, convert_to_numpy=True
+            )
             return np.array(embeddings, dtype=np.float32)
         # Fallback: random embeddings (for testing without GPU deps)
         return np.random.randn(len(texts), self._dimension).astype(np.float32)
 
+    def _embed_query_bytes(self, text: str) -> bytes:
+        """Embed a single query, returned as bytes for the LRU memo."""
+        return self._embed([text]).tobytes()
+
     def store(self, entry: SemanticEntry) -> None:
-        """Store a semantic entry with its embedding.
+        """Queue a semantic entry for storage.
 
         Args:
             entry: The semantic entry to store.
         """
-        index = self._get_index()
+        self._pending.append(entry)
+        if len(self._pending) >= self._FLUSH_THRESHOLD:
+            self._flush_pending()
+
+        logger.debug("Stored semantic entry: %s (%s)", entry.content[:50], entry.category)
+
+    def store_many(self, entries: list[SemanticEntry]) -> None:
+        """Queue a batch of semantic entries for storage."""
+        self._pending.extend(entries)
+        if len(self._pending) >= self._FLUSH_THRESHOLD:
+            self._flush_pending()
+
+    def _flush_pending(self) -> None:
+        """Embed and index the buffered entries in one batch."""
+        if not self._pending:
+            return
+        index = self._get_delta()
+        pending, self._pending = self._pending, []
         if index is None:
             logger.warning("FAISS not available, skipping semantic store")
             return
 
-        embedding = self._embed([entry.content])
-        index.add(embedding)
-        self._entries.append(entry)
+        # Length-sorted "smart batching" keeps transformer padding waste
+        # down; the permutation is inverted so index rows match _entries.
+        order = sorted(range(len(pending)), key=lambda i: len(pending[i].content))
+        sorted_embeddings = self._embed([pending[i].content for i in order])
+        embeddings = np.empty_like(sorted_embeddings)
+        embeddings[order] = sorted_embeddings
 
-        logger.debug("Stored semantic entry: %s (%s)", entry.content[:50], entry.category)
+        index.add(embeddings)
+        self._entries.extend(pending)
+        self._maybe_merge_delta()
 
     def search(self, query: str, top_k: int = 5) -> list[tuple[SemanticEntry, float]]:
         """Search for similar entries by semantic similarity.
@@ -104,33 +249,63 @@ class SemanticMemory:
         Returns:
             List of (entry, similarity_score) tuples.
         """
-        index = self._get_index()
-        if index is None or index.ntotal == 0:
+        self._flush_pending()
+        base = self._get_index()
+        if base is None:
+            return []
+        delta = self._delta
+        delta_total = delta.ntotal if delta is not None else 0
+        total = base.ntotal + delta_total
+        if total == 0:
             return []
 
-        query_embedding = self._embed([query])
-        k = min(top_k, index.ntotal)
-        scores, indices = index.search(query_embedding, k)
-
-        results = []
-        for score, idx in zip(scores[0], indices[0]):
-            if idx >= 0 and idx < len(self._entries):
-                results.append((self._entries[idx], float(score)))
+        query_embedding = np.frombuffer(
+            self._embed_query_cached(query), dtype=np.float32
+        ).reshape(1, -1)
+        k = min(top_k, total)
+
+        # Search both shards and merge on score; delta rows sit after the
+        # base rows in _entries, so their ids shift by base.ntotal.
+        hits: list[tuple[float, int]] = []
+        for index, offset in ((base, 0), (delta, base.ntotal)):
+            if index is None or index.ntotal == 0:
+                continue
+            scores, indices = index.search(query_embedding, min(k, index.ntotal))
+            hits.extend(
+                (float(score), int(idx) + offset)
+                for score, idx in zip(scores[0], indices[0])
+                if idx >= 0
+            )
+        hits.sort(key=lambda hit: hit[0], reverse=True)
 
-        return results
+        return [
+            (self._entries[idx], score)
+            for score, idx in hits[:k]
+            if idx < len(self._entries)
+        ]
 
     def save(self) -> None:
-        """Persist index and entries to disk."""
+        """Persist index shards and entries to disk.
+
+        Routine saves rewrite only the small delta shard; the base shard
+        is rewritten once per merge (or IVFPQ upgrade), so persistence
+        cost is amortized O(1) per insert instead of O(N) per save.
+        """
+        self._flush_pending()
         self.index_path.parent.mkdir(parents=True, exist_ok=True)
 
-        index = self._get_index()
-        if index and index.ntotal > 0:
-            try:
-                import faiss
+        try:
+            import faiss
 
-                faiss.write_index(index, str(self.index_path))
-            except ImportError:
-                pass
+            if self._base_dirty and self._index is not None:
+                faiss.write_index(self._index, str(self.index_path))
+                self._base_dirty = False
+            if self._delta is not None and self._delta.ntotal > 0:
+                faiss.write_index(self._delta, str(self.delta_path))
+            elif self.delta_path.exists():
+                self.delta_path.unlink()  # Stale after a merge emptied the delta
+        except ImportError:
+            pass
 
         # Save entries as JSON
         entries_data = []
@@ -144,8 +319,11 @@ class SemanticMemory:
                 }
             )
 
-        with open(self.entries_path, "w") as f:
-            json.dump(entries_data, f, indent=2)
+        if orjson is not None:
+            self.entries_path.write_bytes(orjson.dumps(entries_data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(self.entries_path, "w") as f:
+                json.dump(entries_data, f, indent=2)
 
         logger.info("Saved %d semantic entries", len(self._entries))
 
@@ -153,21 +331,24 @@ class SemanticMemory:
         """Load persisted index and entries."""
         if self.entries_path.exists():
             try:
-                with open(self.entries_path) as f:
-                    entries_data = json.load(f)
+                raw = self.entries_path.read_bytes()
+                entries_data = orjson.loads(raw) if orjson is not None else json.loads(raw)
                 self._entries = [SemanticEntry(**ed) for ed in entries_data]
                 logger.info("Loaded %d semantic entries", len(self._entries))
-            except (json.JSONDecodeError, KeyError) as e:
+            except (ValueError, KeyError) as e:
                 logger.warning("Failed to load semantic entries: %s", e)
 
-        if self.index_path.exists():
+        if self.index_path.exists() or self.delta_path.exists():
             try:
                 import faiss
 
-                self._index = faiss.read_index(str(self.index_path))
+                if self.index_path.exists():
+                    self._index = faiss.read_index(str(self.index_path))
+                if self.delta_path.exists():
+                    self._delta = faiss.read_index(str(self.delta_path))
             except (ImportError, RuntimeError) as e:
                 logger.warning("Failed to load FAISS index: %s", e)
 
     @property
     def count(self) -> int:
-        return len(self._entries)
+        return len(self._entries) + len(self._pending)
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -21,8 +22,17 @@ class WorkingMemory:
     """
 
     max_items: int = 20
-    _store: dict[str, Any] = field(default_factory=dict)
-    _access_order: list[str] = field(default_factory=list)
+    # OrderedDict doubles as store and recency order: insertion order is
+    # access order, so LRU moves and evictions are O(1) instead of the
+    # O(n) list.remove/pop(0) a separate order list would cost.
+    _store: OrderedDict[str, Any] = field(default_factory=OrderedDict)
+    _version: int = 0
+    _context_cache: str | None = None
+
+    @property
+    def version(self) -> int:
+        """Monotonic counter bumped on every mutation; used for cache keys."""
+        return self._version
 
     def set(self, key: str, value: Any) -> None:
         """Store a key-value pair in working memory.
@@ -31,58 +41,65 @@ class WorkingMemory:
             key: Memory key (e.g., "current_file", "test_results").
             value: Any value to store.
         """
-        if key in self._store:
-            self._access_order.remove(key)
-
+        self._store.pop(key, None)
         self._store[key] = value
-        self._access_order.append(key)
+        self._version += 1
+        self._context_cache = None
 
         # Evict oldest entries if over capacity
         while len(self._store) > self.max_items:
-            oldest = self._access_order.pop(0)
-            del self._store[oldest]
+            oldest, _ = self._store.popitem(last=False)
             logger.debug("Evicted working memory key: %s", oldest)
 
     def get(self, key: str, default: Any = None) -> Any:
         """Retrieve a value from working memory."""
         if key in self._store:
-            # Move to end (most recently accessed)
-            self._access_order.remove(key)
-            self._access_order.append(key)
+            # Move to end (most recently accessed); the reorder changes the
+            # rendered context, so version-keyed caches must miss too
+            self._store.move_to_end(key)
+            self._version += 1
+            self._context_cache = None
         return self._store.get(key, default)
 
     def delete(self, key: str) -> bool:
         """Remove a key from working memory. Returns True if key existed."""
-        if key in self._store:
-            del self._store[key]
-            self._access_order.remove(key)
+        if self._store.pop(key, None) is not None:
+            self._version += 1
+            self._context_cache = None
             return True
         return False
 
     def clear(self) -> None:
         """Clear all working memory."""
         self._store.clear()
-        self._access_order.clear()
+        self._version += 1
+        self._context_cache = None
 
     def to_context_string(self) -> str:
         """Render working memory as a string for injection into system prompt.
 
+        The rendered string is cached and invalidated on any mutation, so
+        repeated calls between tool results are free.
+
         Returns:
             Formatted string representation of current memory state.
         """
+        if self._context_cache is not None:
+            return self._context_cache
+
         if not self._store:
             return "Working memory: (empty)"
 
         lines = ["Working memory:"]
-        for key in self._access_order:
-            value = self._store[key]
+        for key, value in self._store.items():
             # Truncate long values
             val_str = str(value)
             if len(val_str) > 200:
                 val_str = val_str[:200] + "..."
             lines.append(f"  {key}: {val_str}")
 
-        return "\n".join(lines)
+        self._context_cache = "\n".join(lines)
+        return self._context_cache
 
     @property
     def keys(self) -> list[str]:
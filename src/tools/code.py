@@ -3,8 +3,12 @@
 from __future__ import annotations
 
 import ast
+import contextlib
+import importlib.util
+import io
 import logging
 import subprocess
+from collections import OrderedDict
 from pathlib import Path
 
 from pydantic import BaseModel, Field
@@ -13,6 +17,16 @@ from src.tools.base import BaseTool, ToolResult
 
 logger = logging.getLogger(__name__)
 
+# pytest-xdist enables sharding test runs across cores; probe once so the
+# runner can silently fall back to serial when it is not installed.
+_HAS_XDIST = importlib.util.find_spec("xdist") is not None
+
+# Agents re-check the same files across loop iterations; results are keyed
+# by (path, mtime_ns, size) so any write invalidates naturally. Bounded
+# LRU — oldest entries fall out past _AST_CACHE_MAX.
+_AST_CACHE: OrderedDict[tuple[str, int, int], ToolResult] = OrderedDict()
+_AST_CACHE_MAX = 256
+
 
 class ASTCheckTool(BaseTool):
     """Validate Python syntax using AST parsing."""
@@ -29,18 +43,33 @@ class ASTCheckTool(BaseTool):
         params = self.InputModel(**kwargs)
         path = Path(params.path)
 
-        if not path.exists():
+        try:
+            st = path.stat()
+        except OSError:
             return ToolResult(output="", success=False, error=f"File not found: {path}")
 
+        key = (str(path), st.st_mtime_ns, st.st_size)
+        cached = _AST_CACHE.get(key)
+        if cached is not None:
+            _AST_CACHE.move_to_end(key)
+            return cached
+
         try:
             source = path.read_text(encoding="utf-8")
             ast.parse(source, filename=str(path))
-            return ToolResult(output=f"Syntax OK: {path}")
+            result = ToolResult(output=f"Syntax OK: {path}")
         except SyntaxError as e:
             error_msg = f"Syntax error at line {e.lineno}: {e.msg}"
             if e.text:
                 error_msg += f"\n  {e.text.rstrip()}"
-            return ToolResult(output=error_msg, success=False, error=error_msg)
+            result = ToolResult(output=error_msg, success=False, error=error_msg)
+        except IsADirectoryError:
+            return ToolResult(output="", success=False, error=f"Not a file: {path}")
+
+        _AST_CACHE[key] = result
+        while len(_AST_CACHE) > _AST_CACHE_MAX:
+            _AST_CACHE.popitem(last=False)
+        return result
 
 
 class LintTool(BaseTool):
@@ -90,22 +119,41 @@ class TestRunnerTool(BaseTool):
     description = "Run pytest on a file or directory and return the results."
 
     class InputModel(BaseModel):
-        path: str = Field(default="tests/", description="File or directory to test")
+        path: str | list[str] = Field(
+            default="tests/",
+            description="File or directory to test, or a list of targets",
+        )
         verbose: bool = Field(default=True, description="Show verbose output")
         specific_test: str = Field(
             default="", description="Specific test name to run (e.g., test_foo)"
         )
+        workers: int = Field(
+            default=0, description="pytest-xdist worker count (0 = serial)"
+        )
+        use_inprocess: bool = Field(
+            default=False, description="Run pytest in-process instead of a subprocess"
+        )
 
     def execute(self, **kwargs) -> ToolResult:
         params = self.InputModel(**kwargs)
 
-        args = ["python", "-m", "pytest", params.path]
+        # path may carry several targets (affected-test runs); passing a
+        # list keeps single paths containing spaces intact
+        targets = params.path if isinstance(params.path, list) else [params.path]
+        pytest_args = [*targets]
         if params.verbose:
-            args.append("-v")
-        args.extend(["--tb", "short"])
+            pytest_args.append("-v")
+        pytest_args.extend(["--tb", "short"])
+        if params.workers > 1 and _HAS_XDIST:
+            pytest_args.extend(["-n", str(params.workers)])
 
         if params.specific_test:
-            args.extend(["-k", params.specific_test])
+            pytest_args.extend(["-k", params.specific_test])
+
+        if params.use_inprocess:
+            return self._execute_inprocess(pytest_args)
+
+        args = ["python", "-m", "pytest", *pytest_args]
 
         try:
             result = subprocess.run(
@@ -127,3 +175,23 @@ class TestRunnerTool(BaseTool):
 
         except subprocess.TimeoutExpired:
             return ToolResult(output="", success=False, error="Tests timed out after 120s")
+
+    @staticmethod
+    def _execute_inprocess(pytest_args: list[str]) -> ToolResult:
+        """Run pytest via pytest.main, skipping the interpreter spawn.
+
+        Trades the per-call Python startup and plugin-import cost for
+        in-process execution. The subprocess path stays the default: it
+        gives a fresh module state per run, which in-process runs do not.
+        """
+        import pytest
+
+        buffer = io.StringIO()
+        with contextlib.redirect_stdout(buffer), contextlib.redirect_stderr(buffer):
+            returncode = pytest.main(pytest_args)
+
+        return ToolResult(
+            output=buffer.getvalue().strip(),
+            success=returncode == 0,
+            error="Tests failed" if returncode != 0 else None,
+        )
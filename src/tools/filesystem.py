@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
+import functools
+import itertools
 import logging
+import os
+import re
 from pathlib import Path
 
 from pydantic import BaseModel, Field
@@ -12,6 +16,48 @@ from src.tools.base import BaseTool, ToolResult
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=128)
+def _compile_glob(pattern: str) -> re.Pattern[str]:
+    """Compile a glob pattern into a regex over /-separated relative paths.
+
+    Mirrors pathlib glob semantics: ``*`` and ``?`` stay within one path
+    segment, and a ``**`` segment spans zero or more directories.
+    """
+    i, n = 0, len(pattern)
+    out = []
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern[i : i + 3] == "**/":
+                out.append("(?:[^/]+/)*")
+                i += 3
+            elif pattern[i : i + 2] == "**":
+                out.append(".*")
+                i += 2
+            else:
+                out.append("[^/]*")
+                i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[":
+            j = pattern.find("]", i + 1)
+            if j == -1:
+                out.append(re.escape(c))
+                i += 1
+            else:
+                cls = pattern[i + 1 : j]
+                # Glob negates classes with a leading !, regex with ^
+                if cls.startswith("!"):
+                    cls = "^" + cls[1:]
+                out.append(f"[{cls}]")
+                i = j + 1
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return re.compile("".join(out) + r"\Z")
+
+
 class ReadFileTool(BaseTool):
     """Read the contents of a file."""
 
@@ -33,21 +79,35 @@ class ReadFileTool(BaseTool):
         if not path.is_file():
             return ToolResult(output="", success=False, error=f"Not a file: {path}")
 
+        # Stream the requested window instead of loading the whole file:
+        # peak memory stays O(max_lines) and I/O stops at the window's end
+        # unless the remainder has to be counted for the footer.
         try:
-            content = path.read_text(encoding="utf-8", errors="replace")
+            with path.open("r", encoding="utf-8", errors="replace") as f:
+                sliced = [
+                    line.rstrip("\n")
+                    for line in itertools.islice(f, params.offset, params.offset + params.max_lines)
+                ]
+                shown = len(sliced)
+                if shown == params.max_lines:
+                    # File may continue past the window; count the rest
+                    total = params.offset + shown + sum(1 for _ in f)
+                elif shown:
+                    total = params.offset + shown
+                else:
+                    # Empty window: the offset may lie past end-of-file, in
+                    # which case islice consumed fewer lines than it skipped
+                    # and offset + shown would overstate; count from the top
+                    f.seek(0)
+                    total = sum(1 for _ in f)
         except PermissionError:
             return ToolResult(output="", success=False, error=f"Permission denied: {path}")
 
-        lines = content.splitlines()
-        sliced = lines[params.offset : params.offset + params.max_lines]
-
         numbered = []
         for i, line in enumerate(sliced, start=params.offset + 1):
             numbered.append(f"{i:>5}| {line}")
 
         output = "\n".join(numbered)
-        total = len(lines)
-        shown = len(sliced)
 
         if shown < total:
             output += f"\n\n[Showing lines {params.offset + 1}-{params.offset + shown} of {total}]"
@@ -101,12 +161,17 @@ class ListDirectoryTool(BaseTool):
 
         entries = []
         try:
-            items = sorted(path.iterdir(), key=lambda p: (not p.is_dir(), p.name.lower()))
+            # One scandir pass covers listing, sorting, and the total count;
+            # DirEntry caches is_dir/stat, so no extra syscalls per entry.
+            with os.scandir(path) as it:
+                items = list(it)
+            items.sort(key=lambda e: (not e.is_dir(follow_symlinks=False), e.name.lower()))
+            total = len(items)
             for item in items[: params.max_entries]:
-                if item.is_dir():
+                if item.is_dir(follow_symlinks=False):
                     entries.append(f"  [dir]  {item.name}/")
                 else:
-                    size = item.stat().st_size
+                    size = item.stat(follow_symlinks=False).st_size
                     if size < 1024:
                         size_str = f"{size}B"
                     elif size < 1024 * 1024:
@@ -115,7 +180,6 @@ class ListDirectoryTool(BaseTool):
                         size_str = f"{size / (1024 * 1024):.1f}MB"
                     entries.append(f"  {size_str:>8}  {item.name}")
 
-            total = len(list(path.iterdir()))
             output = f"{path}/  ({total} items)\n" + "\n".join(entries)
 
             if total > params.max_entries:
@@ -146,11 +210,21 @@ class GlobTool(BaseTool):
 
         matches = []
         try:
-            for match in root.glob(params.pattern):
-                if not any(part.startswith(".") for part in match.parts[len(root.parts) :]):
-                    matches.append(str(match))
-                    if len(matches) >= params.max_results:
-                        break
+            # Walk manually so hidden subtrees (.git, .venv, ...) are pruned
+            # before descent instead of expanded by glob and filtered after;
+            # traversal cost is O(visited files), not O(tree).
+            regex = _compile_glob(params.pattern)
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+                rel = os.path.relpath(dirpath, root)
+                prefix = "" if rel == "." else rel.replace(os.sep, "/") + "/"
+                for name in itertools.chain(dirnames, filenames):
+                    if not name.startswith(".") and regex.match(prefix + name):
+                        matches.append(str(Path(dirpath, name)))
+                        if len(matches) >= params.max_results:
+                            break
+                if len(matches) >= params.max_results:
+                    break
 
             if not matches:
                 return ToolResult(output=f"No files matching '{params.pattern}' in {root}")
@@ -7,6 +7,13 @@ import logging
 from pathlib import Path
 from typing import Any
 
+try:
+    # orjson serializes large trace trees several times faster than the
+    # stdlib, which matters when saving traces on every task completion.
+    import orjson
+except ImportError:
+    orjson = None
+
 from src.trace.models import EventType, TraceEvent, TraceSpan
 
 logger = logging.getLogger(__name__)
@@ -112,8 +119,11 @@ class TraceCollector:
         self.log_dir.mkdir(parents=True, exist_ok=True)
         path = self.log_dir / f"trace_{self.task_id}.json"
 
-        with open(path, "w") as f:
-            json.dump(self.to_dict(), f, indent=2)
+        if orjson is not None:
+            path.write_bytes(orjson.dumps(self.to_dict(), option=orjson.OPT_INDENT_2))
+        else:
+            with open(path, "w") as f:
+                json.dump(self.to_dict(), f, indent=2)
 
         logger.info("Saved trace to %s (%d events)", path, self.event_count)
         return path
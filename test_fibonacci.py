@@ -7,7 +7,8 @@ from fibonacci import (
     fibonacci_iterative,
     fibonacci_recursive,
     fibonacci_generator,
-    fibonacci_memoized
+    fibonacci_memoized,
+    fibonacci_fast
 )
 
 
@@ -46,6 +47,14 @@ class TestFibonacci:
         assert fibonacci_memoized(10) == 55
         assert fibonacci_memoized(20) == 6765
     
+    def test_fibonacci_fast(self):
+        """Test the fast dispatcher on both sides of the float threshold."""
+        assert fibonacci_fast(0) == 0
+        assert fibonacci_fast(1) == 1
+        assert fibonacci_fast(10) == 55
+        assert fibonacci_fast(70) == fibonacci_recursive(70)
+        assert fibonacci_fast(100) == fibonacci_recursive(100)
+
     def test_consistency_between_methods(self):
         """Test that all methods produce consistent results."""
         n = 8
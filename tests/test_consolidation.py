@@ -37,38 +37,34 @@ class TestMemoryConsolidator:
         assert consolidator.should_consolidate()
         episodic.close()
 
-    def test_extract_tool_patterns(self):
-        episodes = [
-            Episode(
-                task_id="t1",
-                task_description="Fix bug",
-                outcome="success",
-                summary="Fixed",
-                tool_chain=["read_file", "write_file", "run_tests"],
-                files_modified=[],
-                duration_seconds=10,
-                cost_usd=0.01,
-                timestamp=time.time(),
-            ),
-            Episode(
-                task_id="t2",
-                task_description="Fix other bug",
-                outcome="success",
-                summary="Fixed too",
-                tool_chain=["read_file", "write_file", "run_tests"],
-                files_modified=[],
-                duration_seconds=10,
-                cost_usd=0.01,
-                timestamp=time.time(),
-            ),
-        ]
+    def test_top_tool_chains(self, tmp_path):
+        episodic = EpisodicMemory(db_path=str(tmp_path / "ep.db"))
+        for i, desc in enumerate(["Fix bug", "Fix other bug"]):
+            episodic.store(
+                Episode(
+                    task_id=f"t{i + 1}",
+                    task_description=desc,
+                    outcome="success",
+                    summary="Fixed",
+                    tool_chain=["read_file", "write_file", "run_tests"],
+                    files_modified=[],
+                    duration_seconds=10,
+                    cost_usd=0.01,
+                    timestamp=time.time(),
+                )
+            )
 
-        patterns = MemoryConsolidator._extract_tool_patterns(episodes)
-        assert len(patterns) > 0
-        assert "read_file" in patterns[0][0]
+        chains = episodic.top_tool_chains()
+        assert len(chains) == 1
+        chain, count, task_ids = chains[0]
+        assert "read_file" in chain
+        assert count == 2
+        assert sorted(task_ids) == ["t1", "t2"]
+        episodic.close()
 
-    def test_extract_file_patterns(self):
-        episodes = [
+    def test_frequent_files(self, tmp_path):
+        episodic = EpisodicMemory(db_path=str(tmp_path / "ep.db"))
+        episodic.store(
             Episode(
                 task_id="t1",
                 task_description="Task 1",
@@ -79,7 +75,9 @@ class TestMemoryConsolidator:
                 duration_seconds=10,
                 cost_usd=0.01,
                 timestamp=time.time(),
-            ),
+            )
+        )
+        episodic.store(
             Episode(
                 task_id="t2",
                 task_description="Task 2",
@@ -90,9 +88,13 @@ class TestMemoryConsolidator:
                 duration_seconds=10,
                 cost_usd=0.01,
                 timestamp=time.time(),
-            ),
-        ]
+            )
+        )
 
-        patterns = MemoryConsolidator._extract_file_patterns(episodes)
-        assert len(patterns) > 0
-        assert "config.py" in patterns[0][0]
+        patterns = episodic.frequent_files(["t1", "t2"])
+        assert len(patterns) == 1
+        file_path, count, task_ids = patterns[0]
+        assert file_path == "src/config.py"
+        assert count == 2
+        assert sorted(task_ids) == ["t1", "t2"]
+        episodic.close()
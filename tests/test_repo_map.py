@@ -39,6 +39,19 @@ class TestRepoMapBuilder:
         repo_map = builder.build(tmp_path)
         assert repo_map.total_files == 0
 
+    def test_parse_cache_persists(self, tmp_path):
+        (tmp_path / "app.py").write_text("def start():\n    pass\n")
+
+        first = RepoMapBuilder().build(tmp_path)
+        assert (tmp_path / ".koda" / "parse-cache.sqlite").exists()
+
+        # A fresh builder gets identical results served from the cache
+        second = RepoMapBuilder().build(tmp_path)
+        assert second.total_symbols == first.total_symbols
+        paths = [e.path for e in second.entries]
+        assert "app.py" in paths
+        assert not any(".koda" in p for p in paths)
+
     def test_reference_ranking(self, tmp_path):
         # helper.py should rank higher because it's imported
         (tmp_path / "main.py").write_text("from helper import run\n\ndef main():\n    run()\n")